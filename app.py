@@ -1,148 +1,150 @@
 import streamlit as st
 import pandas as pd
-from io import StringIO
+import os
+import tempfile
 
 # Import your modules
-from programs import convert_programs
-from grades import convert_grades, validate_converted_data
-from graduate_grades import check_graduate_grades
-from courses import convert_courses
-from course_equivalency import two_way_course_equivalency
-from cleaning_equivalency import remove_reverse_duplicates
-from students import convert_students
-from sis import find_duplicate_differences, check_fields
-from pre_req import check_prerequisites
-from clean import personal_information, insti, category_bachelor, category_graduate, mob_mr_ms
+import ui
+from conversion_cache import ConversionCache, UploadCache, content_digest
+from conversions import OPTIONS, CATEGORIES, get_conversion, read_csv
+from exports import FORMATS, export, export_name
+from grading import show_validation
+from preview import paginated_preview
+from streaming import convert_csv_in_chunks
+
+
+@st.cache_resource
+def get_conversion_cache():
+    """One cache shared by every session; FEUPLOADER_CACHE_MB / FEUPLOADER_CACHE_DIR tune it."""
+    return ConversionCache(
+        max_bytes=int(os.environ.get("FEUPLOADER_CACHE_MB", "1024")) * 1024 * 1024,
+        disk_dir=os.environ.get("FEUPLOADER_CACHE_DIR") or None,
+    )
+
+
+@st.cache_resource
+def get_upload_cache():
+    """Parsed uploads shared by every session; FEUPLOADER_UPLOAD_CACHE_DIR moves the Feather files."""
+    return UploadCache(
+        disk_dir=os.environ.get("FEUPLOADER_UPLOAD_CACHE_DIR")
+        or os.path.join(tempfile.gettempdir(), "feuploader-uploads"),
+        max_bytes=int(os.environ.get("FEUPLOADER_CACHE_MB", "1024")) * 1024 * 1024,
+    )
+
+
+def upload_digest(uploaded_file) -> str:
+    """Content digest of an upload, hashed once per uploaded file."""
+    digests = st.session_state.setdefault("upload_digests", {})
+    file_id = getattr(uploaded_file, "file_id", None) or (uploaded_file.name, uploaded_file.size)
+    if file_id not in digests:
+        digests[file_id] = content_digest(uploaded_file.getvalue())
+    return digests[file_id]
+
 
 st.title("🎓 ERP → Edusuite Data Converter (CSV)")
 
 # -------------------- SELECTIONS --------------------
-option = st.selectbox(
-    "Select conversion type:",
-    [
-        "Programs",
-        "Grades",
-        "Graduate Grades",
-        "Courses",
-        "Students",
-        "SIS",
-        "Pre-Requisites",
-        "Cleaning SIS",
-        "Two-way Equivalency",
-        "Cleaning Equivalency"
-    ]
-)
+option = st.selectbox("Select conversion type:", OPTIONS)
 
-if option == "SIS":
-    category = st.radio(
-        "Select which applies",
-        ["Check for duplicates", "Convert only", "Check Name Fields", "Select All"]
-    )
+category = None
+if option in CATEGORIES:
+    category = st.radio("Select which applies", CATEGORIES[option])
 
-elif option == "Cleaning SIS":
-    category2 = st.radio(
-        "Select which applies",
-        ["Personal Information", "Institute", "Category Undergrad", "Category Graduate", "Mobile Phone and Mr./Ms."]
-    )
+conversion = get_conversion(option, category)
+file_name = conversion.file_name
+
+streaming = conversion.row_local and st.checkbox(
+    "🚰 Stream in chunks (for multi-GB files; all columns are read as text)",
+    help="The conversion holds one chunk at a time, but the download button still loads the "
+         "whole converted file into memory. For files larger than the server's memory, use cli.py.",
+)
 
 # -------------------- FILE UPLOAD --------------------
 uploaded_file = st.file_uploader("📂 Upload raw ERP CSV", type=["csv"])
 
-if uploaded_file:
-    # --- Read CSV normally ---
+if uploaded_file and streaming:
+    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
+        output_path = tmp.name
+    errors_path = output_path[:-len(".csv")] + "_errors.csv"
+
     try:
-        df = pd.read_csv(uploaded_file, encoding="utf-8")
-    except UnicodeDecodeError:
-        uploaded_file.seek(0)
-        df = pd.read_csv(uploaded_file, encoding="latin1")
-
-
-    # -------------------- DETERMINE CONVERSION PATH --------------------
-    if option == "Programs":
-        converted_df = convert_programs(df)
-        file_name = "converted_programs.csv"
-
-    elif option == "Grades":
-        converted_df = convert_grades(df)
-        file_name = "converted_grades.csv"
-
-    elif option == "Graduate Grades":
-        converted_df = check_graduate_grades(df)
-        file_name = "graduate_grades.csv"
-
-    elif option == "Courses":
-        converted_df = convert_courses(df)
-        file_name = "converted_courses.csv"
-
-    elif option == "Students":
-        converted_df = convert_students(df)
-        file_name = "converted_students.csv"
-
-    elif option == "Pre-Requisites":
-        converted_df = check_prerequisites(df)
-        file_name = "pre_requisites.csv"
-
-    elif option == "Two-way Equivalency":
-        converted_df = two_way_course_equivalency(df)
-        file_name = "two_way_equivalency.csv"
-    
-    elif option == "Cleaning Equivalency":
-        converted_df = remove_reverse_duplicates(df)
-        file_name = "Two_way_course_equivalency_final.csv"
-
-    elif option == "Cleaning SIS":
-        if category2 == "Personal Information":
-            converted_df = personal_information(df)
-            file_name = "sis_personal_information.csv"
-
-        elif category2 == "Institute":
-            converted_df = insti(df)
-            file_name = "sis_institute_information.csv"
-
-        elif category2 == "Category Undergrad":
-            converted_df = category_bachelor(df)
-            file_name = "sis_category_bachelor.csv"
-        
-        elif category2 == "Category Graduate":
-            converted_df = category_graduate(df)
-            file_name = "sis_category_graduate.csv"
-
-        elif category2 == "Mobile Phone and Mr./Ms.":
-            converted_df = mob_mr_ms(df)
-            file_name = "sis_mobilephone_mrms.csv"
-
-
-    elif option == "SIS":
-        if category == "Check for duplicates":
-            converted_df = find_duplicate_differences(df)
-            file_name = "converted_duplicate_sis.csv"
-
-        elif category == "Convert only":
-            converted_df = convert_students(df)
-            file_name = "converted_sis.csv"
-
-        elif category == "Check Name Fields":
-            converted_df = check_fields(df)
-            file_name = "converted_checked_fields.csv"
-
-        else:  # "Select All"
-            duplicates_df = find_duplicate_differences(df)
-            converted_df = convert_students(df)
-            file_name = "converted_sis_all.csv"
+        rows, counts = convert_csv_in_chunks(
+            uploaded_file, output_path, conversion.chunk_converter(), conversion.validate,
+            errors_destination=errors_path if conversion.validate else None,
+            usecols=conversion.schema.usecols if conversion.schema else None
+        )
+
+        if counts:
+            show_validation(counts)
+
+            if any(counts.values()):
+                with open(errors_path, "rb") as f:
+                    st.download_button(
+                        label="⬇️ Download errors.csv",
+                        data=f,
+                        file_name="errors.csv",
+                        mime="text/csv"
+                    )
+
+        if rows:
+            st.subheader("✅ Converted Data Preview")
+            st.dataframe(pd.read_csv(output_path, nrows=100, dtype=str))
+
+        # st.download_button reads the whole file into memory, so the memory bound
+        # of streaming covers the conversion, not the download; cli.py has no such step
+        with open(output_path, "rb") as f:
+            st.download_button(
+                label="⬇️ Download Converted CSV",
+                data=f,
+                file_name=file_name,
+                mime="text/csv"
+            )
+    finally:
+        os.remove(output_path)
+        if os.path.exists(errors_path):
+            os.remove(errors_path)
+
+    st.success(f"✅ {option} conversion complete! {rows:,} rows streamed.")
+
+elif uploaded_file:
+    # -------------------- CONVERT (CACHED) --------------------
+    # The upload is only loaded on a conversion cache miss, and only parsed once per
+    # content and ingest schema (the columns and dtypes this conversion reads)
+    digest = upload_digest(uploaded_file)
+    key = (digest, option, category, ui.clicked_buttons())
+    parsed_key = f"{digest}-{conversion.schema.fingerprint()}" if conversion.schema else digest
+    # A confirmation click is applied to the run that stopped for it, not converted again
+    converted_df, report, _, _ = get_conversion_cache().run(
+        key, conversion,
+        lambda: get_upload_cache().load(parsed_key, lambda: read_csv(uploaded_file, conversion.schema)),
+        unconfirmed_key=(digest, option, category, ()),
+    )
+
+    # -------------------- VALIDATION --------------------
+    if report is not None:
+        report.show()
+
+        if report.failed.any():
+            st.download_button(
+                label="⬇️ Download errors.csv",
+                data=lambda: report.errors().to_csv(index=False),
+                file_name="errors.csv",
+                mime="text/csv"
+            )
 
     # -------------------- OUTPUT --------------------
     st.subheader("✅ Converted Data Preview")
-    st.dataframe(converted_df)
+    paginated_preview(converted_df, report)
 
-    # Save to CSV
-    csv_buffer = StringIO()
-    converted_df.to_csv(csv_buffer, index=False)
+    # Rendered only when the button is clicked; Streamlit then holds the file in memory
+    export_format = st.radio("Download format", list(FORMATS), horizontal=True)
+    _, mime = FORMATS[export_format]
 
     st.download_button(
-        label="⬇️ Download Converted CSV",
-        data=csv_buffer.getvalue(),
-        file_name=file_name,
-        mime="text/csv"
+        label=f"⬇️ Download Converted {export_format}",
+        data=lambda: export(converted_df, export_format, file_name),
+        file_name=export_name(file_name, export_format),
+        mime=mime
     )
 
     st.success(f"✅ {option} conversion complete!")
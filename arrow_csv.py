@@ -0,0 +1,191 @@
+"""Multi-threaded CSV parsing and writing with pyarrow.
+
+Both directions aim to give exactly what pandas gives, so callers can use
+these functions first and fall back to ``pd.read_csv`` / ``DataFrame.to_csv``
+when they raise :class:`Unsupported` (or an Arrow error on malformed input):
+
+* Reading uses pandas' missing-value strings and boolean spellings, reads
+  category columns as dictionaries, and keeps values Arrow would turn into
+  dates or times as the text they were written as.
+* Writing only quotes values that need it, like ``csv.QUOTE_MINIMAL``, and
+  formats floats and booleans the way pandas does.
+"""
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
+
+# pandas' default na_values
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+TRUE_VALUES = ["True", "TRUE", "true"]
+FALSE_VALUES = ["False", "FALSE", "false"]
+
+# Arrow reads hex as integers, where pandas keeps the text
+HEX = r"^\s*[-+]?0[xX]"
+# Arrow reads integers with a "+" sign or beyond int64 as float64, where
+# pandas gives int64, uint64 or text
+INTEGER = r"^\s*[-+]?[0-9]+\s*$"
+
+
+class Unsupported(Exception):
+    """The input or frame needs pandas' own CSV engine to come out the same."""
+
+
+def _header(data: bytes, encoding: str) -> list:
+    first_line = data.split(b"\n", 1)[0].decode(encoding).lstrip("\ufeff").rstrip("\r")
+    return next(csv.reader([first_line]), [])
+
+
+def read_csv(data: bytes, usecols=None, categories=()) -> pd.DataFrame:
+    """Parse CSV ``data`` like ``pd.read_csv`` would, as utf-8 or else latin1.
+
+    ``usecols`` is a column-name predicate and ``categories`` the columns to
+    read as category, as in :class:`conversions.IngestSchema`.
+    """
+    encoding = "utf-8"
+    table = _read_table(data, encoding, usecols, categories)
+    if any(pa.types.is_binary(field.type) for field in table.schema):
+        # Not valid utf-8: Arrow kept raw bytes, pandas would retry as latin1
+        encoding = "latin1"
+        table = _read_table(data, encoding, usecols, categories)
+
+    names = table.column_names
+    if len(set(names)) != len(names) or "" in names:
+        raise Unsupported("duplicate or blank column names")  # pandas renames them
+    if table.num_rows == 0:
+        raise Unsupported("no rows")  # pandas' empty columns are object, not typed
+
+    # Dates and times were only inferred by Arrow; give back the original text
+    temporal = [f.name for f in table.schema
+                if pa.types.is_time(f.type) or pa.types.is_timestamp(f.type)]
+    if temporal:
+        table = _read_table(data, encoding, usecols, categories, strings=temporal)
+    _check_numbers(data, encoding, table)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_date32(field.type):  # only inferred from YYYY-MM-DD
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+        elif pa.types.is_null(field.type):  # an all-empty column is float NaN in pandas
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+
+    df = table.to_pandas()
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].notna(), np.nan)  # None → NaN, as pandas reads it
+    return df
+
+
+def _has_hex_prefix(data: bytes) -> bool:
+    """Whether "0x" or "0X" occurs anywhere in ``data``."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    x = np.flatnonzero((raw[1:] | 0x20) == ord("x"))
+    return bool((raw[x] == ord("0")).any())
+
+
+def _check_numbers(data, encoding, table):
+    """Raise :class:`Unsupported` where Arrow's numeric inference disagrees with pandas'.
+
+    The columns are only re-read as text when they could disagree: integers
+    when the file contains "0x" at all, and floats without missing values
+    whose values are all whole numbers.
+    """
+    integers = []
+    if _has_hex_prefix(data):
+        integers = [f.name for f in table.schema if pa.types.is_integer(f.type)]
+    # Floats with missing values are float64 in pandas too
+    floats = [f.name for f in table.schema
+              if pa.types.is_floating(f.type) and table.column(f.name).null_count == 0
+              and pc.all(pc.equal(table.column(f.name), pc.floor(table.column(f.name)))).as_py()]
+    if not integers and not floats:
+        return
+
+    text = _read_table(data, encoding, lambda c: c in integers or c in floats, (), strings=integers + floats)
+    for col in integers:
+        if pc.any(pc.match_substring_regex(text.column(col), HEX)).as_py():
+            raise Unsupported(f"column {col!r} has hexadecimal values")
+    for col in floats:
+        if pc.all(pc.match_substring_regex(text.column(col), INTEGER)).as_py():
+            raise Unsupported(f"column {col!r} has integers Arrow cannot read as int64")
+
+
+def _read_table(data, encoding, usecols, categories, strings=()):
+    columns = None
+    if usecols is not None:
+        columns = [c for c in _header(data, encoding) if usecols(c)]
+
+    column_types = {col: pa.dictionary(pa.int32(), pa.string()) for col in categories}
+    column_types.update({col: pa.string() for col in strings})
+
+    return pacsv.read_csv(
+        pa.BufferReader(data),
+        read_options=pacsv.ReadOptions(encoding=encoding),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=columns,
+            column_types=column_types,
+            null_values=NA_VALUES,
+            true_values=TRUE_VALUES,
+            false_values=FALSE_VALUES,
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=True,
+        ),
+    )
+
+
+def _arrow_column(values: pd.Series) -> pa.Array:
+    """The column as Arrow strings or integers, rendered as ``to_csv`` renders it."""
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+        dtype = values.dtype
+
+    if pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_extension_array_dtype(dtype):
+        return pa.array(values.to_numpy())
+    if pd.api.types.is_float_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        array = values.to_numpy()
+        if array.dtype.kind not in "fb":  # nullable extension dtypes
+            raise Unsupported(f"column {values.name!r} has dtype {dtype}")
+        return pa.array(array.astype(str), mask=pd.isna(array))
+    if pd.api.types.is_string_dtype(dtype):
+        try:
+            return pa.array(values, type=pa.string(), from_pandas=True)
+        except (pa.ArrowException, TypeError) as e:  # e.g. numbers mixed into text
+            raise Unsupported(f"column {values.name!r}: {e}")
+    raise Unsupported(f"column {values.name!r} has dtype {dtype}")
+
+
+def write_csv(df: pd.DataFrame, destination, header: bool = True):
+    """Write ``df`` like ``df.to_csv(destination, index=False, header=header)``, through Arrow.
+
+    ``destination`` is a path or a binary file object.
+    """
+    if df.columns.duplicated().any():
+        raise Unsupported("duplicate column names")
+    table = pa.table({str(col): _arrow_column(df[col]) for col in df.columns})
+
+    header_line = io.StringIO()
+    if header:
+        csv.writer(header_line, lineterminator="\n").writerow(df.columns)
+
+    body = pa.BufferOutputStream()
+    try:
+        pacsv.write_csv(table, body, pacsv.WriteOptions(include_header=False, quoting_style="none"))
+    except pa.ArrowInvalid as e:  # a value contains a comma, quote or newline
+        raise Unsupported(str(e))
+
+    if isinstance(destination, (str, bytes)) or hasattr(destination, "__fspath__"):
+        with open(destination, "wb") as f:
+            _write_parts(f, header_line, body)
+    else:
+        _write_parts(destination, header_line, body)
+
+
+def _write_parts(f, header_line, body):
+    f.write(header_line.getvalue().encode("utf-8"))
+    f.write(memoryview(body.getvalue()))
@@ -0,0 +1,66 @@
+"""Time the Cleaning SIS text cleaners per cell against once per distinct value.
+
+Run from the repository root:
+
+    python benchmarks/bench_clean.py --students 300000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clean import (  # noqa: E402
+    apply_unique, clean_contact, clean_relation, clean_title, normalize_title, smart_capitalize,
+)
+from synthetic import make_cleaning_sis  # noqa: E402
+
+
+def per_cell_contact(val):
+    """The per-cell contact cleaner ``clean_contact`` replaced."""
+    if pd.isna(val) or str(val).strip() == "":
+        return ""
+    return re.sub(r'[^0-9]', '', str(val))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=300_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = make_cleaning_sis(args.students, args.seed)
+    cases = [
+        ("Contact No.", per_cell_contact, clean_contact),
+        ("Guardian Name", smart_capitalize, None),
+        ("Relation to Student", clean_relation, None),
+        ("Birth Place", smart_capitalize, None),
+        ("Language Spoken", smart_capitalize, None),
+        ("Mr./Ms.", normalize_title, None),
+        ("Mr./Ms.", clean_title, None),
+    ]
+
+    print(f"{len(df):,} rows")
+    for column, cleaner, vectorized in cases:
+        before, per_cell = timed(df[column].apply, cleaner)
+        if vectorized is None:
+            after, fast = timed(apply_unique, df[column], cleaner)
+        else:
+            after, fast = timed(vectorized, df[column])
+        assert before.tolist() == after.tolist(), column
+        print(f"{column:<22} {cleaner.__name__:<18} per cell {per_cell:6.2f}s   "
+              f"new {fast:6.2f}s   ({per_cell / fast:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Time every app conversion on synthetic exports and record a JSON baseline.
+
+Run from the repository root:
+
+    python benchmarks/bench_converters.py --out baseline.json
+    python benchmarks/bench_converters.py --sizes 10000 100000 --compare baseline.json
+
+Each conversion in ``conversions.CONVERSIONS`` runs on the generator of its
+app option (see :mod:`synthetic`) at every size, with its ingest schema's
+categorical columns as the app reads them and removals confirmed. The
+fastest of ``--repeat`` runs is kept, and the conversion is then run once
+more under ``tracemalloc`` for its peak memory (Python and numpy
+allocations; Arrow-backed strings are not traced). The results, keyed by
+"Option" or "Option / Category" and row count, are written to ``--out``
+together with the git commit. ``--compare`` prints the change against an
+earlier file and exits with 1 when any conversion slowed down by more than
+``--tolerance``.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversions import CONVERSIONS  # noqa: E402
+from synthetic import GENERATORS, ROOT  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def case_name(option, category) -> str:
+    return option if category is None else f"{option} / {category}"
+
+
+def prepare(df: pd.DataFrame, conversion) -> pd.DataFrame:
+    """The frame the app would hand this conversion: schema categories read as category."""
+    if conversion.schema is None:
+        return df
+    categories = [col for col in conversion.schema.categories if col in df.columns]
+    return df.astype({col: "category" for col in categories})
+
+
+def measure(conversion, df: pd.DataFrame, repeat: int, memory: bool) -> dict:
+    seconds = []
+    for _ in range(repeat):
+        frame = df.copy()  # converters may write into their input
+        gc.collect()
+        start = time.perf_counter()
+        conversion.run(frame, confirm=True)
+        seconds.append(time.perf_counter() - start)
+    best = min(seconds)
+    result = {"seconds": round(best, 4), "rows_per_sec": round(len(df) / max(best, 1e-9))}
+
+    if memory:
+        frame = df.copy()
+        gc.collect()
+        tracemalloc.start()
+        conversion.run(frame, confirm=True)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mb"] = round(peak / 2**20, 1)
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    """Print the change against ``baseline``; True when nothing slowed down past ``tolerance``."""
+    ok = True
+    print(f"\nCompared with {baseline.get('commit', 'unknown')}:")
+    for name, sizes in results.items():
+        for rows, result in sizes.items():
+            before = baseline.get("results", {}).get(name, {}).get(rows)
+            if before is None:
+                continue
+            change = result["seconds"] / max(before["seconds"], 1e-9) - 1
+            slower = change > tolerance
+            ok &= not slower
+            print(f"{'❌' if slower else '  '} {name:<50} {int(rows):>9,} rows  "
+                  f"{before['seconds']:8.3f}s → {result['seconds']:8.3f}s  ({change:+.0%})")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="row counts (default: 10k 100k 1M)")
+    parser.add_argument("--only", nargs="+", help="run only these options, e.g. Grades SIS")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--out", default="benchmark.json", help="JSON file to write (default: benchmark.json)")
+    parser.add_argument("--compare", help="earlier JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="slow-down counted as a regression by --compare (default: 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Converter messages go to the feuploader logger; keep the table readable
+    logging.getLogger("feuploader").setLevel(logging.CRITICAL)
+
+    cases = [(option, category) for option, category in CONVERSIONS
+             if args.only is None or option in args.only]
+    results = {}
+    for rows in args.sizes:
+        frames = {}
+        for option, category in cases:
+            if option not in frames:
+                frames[option] = GENERATORS[option](rows, args.seed)
+            conversion = CONVERSIONS[(option, category)]
+            name = case_name(option, category)
+            result = measure(conversion, prepare(frames[option], conversion), args.repeat, not args.no_memory)
+            results.setdefault(name, {})[str(rows)] = result
+            print(f"{name:<50} {rows:>9,} rows  {result['seconds']:8.3f}s  "
+                  f"{result['rows_per_sec']:>12,} rows/s  {result.get('peak_mb', '-'):>8} MB", flush=True)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "seed": args.seed,
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Time convert_programs on a synthetic full-university curriculum export.
+
+Run from the repository root:
+
+    python benchmarks/bench_programs.py --programs 150 --courses 80
+
+Besides the whole conversion, the prerequisite step is timed before and
+after the incremental term index: :func:`baseline_step` is a frozen copy of
+the per-row scan it replaced, :func:`indexed_step` the current walk. Both
+must clean the prerequisites identically. ``--no-baseline`` skips the slow
+copy.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from programs import _prior_courses, _sort_curricula, _split_prereqs, convert_programs  # noqa: E402
+from synthetic import make_programs  # noqa: E402
+
+
+def prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """The columns the prerequisite step sees inside convert_programs."""
+    return pd.DataFrame({
+        "Program Code": df["Program Code"].astype(str).str.replace(r"[^A-Za-z\s]", "", regex=True).str.strip(),
+        "Revision ID": df["Revision ID"].astype(str).str.replace(r"\D", "", regex=True),
+        "Academic Year": pd.to_numeric(df["Academic Year"].astype(str).str.replace(r"\D", "", regex=True)),
+        "Term": df["Term"].str.upper().map(lambda t: 1 if "FIRST" in t else 2 if "SECOND" in t else 3),
+        "Course": df["Course"].astype(str).str.strip(),
+        "Prerequisite": df["Prerequisite"].fillna("").astype(str).str.strip(),
+    })
+
+
+def baseline_step(df: pd.DataFrame) -> pd.DataFrame:
+    """The prerequisite step before the term index, per (Program Code, Revision ID).
+
+    Every row rebuilds the list of its curriculum's earlier courses with a
+    boolean mask and checks each prerequisite against that list. The
+    ``prereq_list`` carry-over between rows is fixed here, so the result can
+    be compared.
+    """
+    parts = []
+    for _, sub_df in df.groupby(["Program Code", "Revision ID"], sort=True):
+        sub_df = sub_df.sort_values(by=["Academic Year", "Term"])
+        for idx, row in sub_df.iterrows():
+            prereq_str = str(row.get("Prerequisite", "")).strip()
+            prereq_list = [p.strip() for p in re.split(r'[,/;]', prereq_str) if p.strip()]
+
+            year = int(row["Academic Year"])
+            term = int(row["Term"])
+
+            # Collect all courses from prior years/terms
+            prior_courses = sub_df[
+                (sub_df["Academic Year"] < year)
+                | ((sub_df["Academic Year"] == year) & (sub_df["Term"] < term))
+            ]["Course"].astype(str).tolist()
+
+            valid_prereqs = [p for p in prereq_list if p in prior_courses]
+            sub_df.at[idx, "Prerequisite"] = ", ".join(valid_prereqs)
+        parts.append(sub_df)
+    return pd.concat(parts)
+
+
+def indexed_step(df: pd.DataFrame) -> pd.DataFrame:
+    """The current step: one sorted walk with the set of courses from earlier terms."""
+    df, groups = _sort_curricula(df, "Academic Year", "Term")
+    prior = _prior_courses(groups, df["Academic Year"].to_numpy(), df["Term"].to_numpy(), df["Course"].to_numpy())
+    df["Prerequisite"] = [
+        ", ".join(p for p in _split_prereqs(prereq) if p in seen_courses)
+        for prereq, seen_courses in zip(df["Prerequisite"].to_numpy(), prior)
+    ]
+    return df
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--programs", type=int, default=150)
+    parser.add_argument("--courses", type=int, default=80, help="courses per program revision")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-baseline", action="store_true", help="skip the frozen pre-index step")
+    args = parser.parse_args()
+
+    # Two revisions per program
+    df = make_programs(args.programs * 2 * args.courses, args.seed, courses_per_revision=args.courses)
+
+    _, elapsed = timed(convert_programs, df)
+    print(f"convert_programs: {len(df):,} rows in {elapsed:.2f}s ({len(df) / elapsed:,.0f} rows/s)")
+
+    prepared = prepare(df)
+    after, fast = timed(indexed_step, prepared.copy())
+    print(f"prerequisite step, term index: {fast:8.2f}s")
+    if args.no_baseline:
+        return
+
+    before, slow = timed(baseline_step, prepared.copy())
+    assert before["Prerequisite"].sort_index().equals(after["Prerequisite"].sort_index())
+    print(f"prerequisite step, per-row scan: {slow:6.2f}s   ({slow / fast:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
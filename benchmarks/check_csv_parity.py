@@ -0,0 +1,84 @@
+"""Check that the Arrow CSV reader and writer give exactly what pandas gives.
+
+Run from the repository root:
+
+    python benchmarks/check_csv_parity.py
+
+Every case of :data:`CORPUS` is read with ``conversions.read_csv`` (Arrow,
+falling back to pandas) and with ``pd.read_csv``, and the frames must be
+equal; the frame is then written back with ``conversions.write_csv`` and
+``to_csv``, and the bytes must be equal. Exits with 1 on any difference.
+"""
+import io
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import arrow_csv  # noqa: E402
+from conversions import read_csv, write_csv  # noqa: E402
+
+CORPUS = {
+    "dates": b"ID,Date of Birth\n1,2001-02-03\n2,2001-02-04\n",
+    "date times": b"ID,Stamp\n1,2001-02-03 04:05:06\n2,2001-02-03T04:05\n",
+    "times": b"ID,Start\n1,07:30\n2,13:00:00\n",
+    "booleans": b"a,b\nTrue,false\nFALSE,true\n",
+    "na spellings": b"a,b,c\nNA,N/A,null\n1,,x\n",
+    "all empty": b"a,b\n1,\n2,\n",
+    "quoted": b'Course,Prerequisite\nIT101,"IT100, IT099"\nIT102,"say ""hi"""\n',
+    "newline in value": b'a,b\n1,"two\nlines"\n',
+    "crlf": b"a,b\r\n1,x\r\n2,y\r\n",
+    "bom": b"\xef\xbb\xbfa,b\n1,x\n",
+    "latin1": "Name,Place\nNiño,Las Piñas\n".encode("latin1"),
+    "floats": b"a,b\n1.5,1e5\n.5,inf\n",
+    "int with missing": b"a,b\n1,x\n,y\n3,z\n",
+    "whitespace numbers": b"a,b\n 12,13 \n14,15\n",
+    "leading zeros": b"a\n007\n8\n",
+    # Arrow's numeric inference disagrees with pandas on these
+    "plus-sign mobile numbers": b"Mobile Phone,Mr./Ms.\n+639171234567,mr\n+639181234567,ms\n",
+    "hex": b"a\n0x1A\n0x2B\n",
+    "above int64": b"a\n18446744073709551615\n1\n",
+    "below int64": b"a\n-9223372036854775809\n1\n",
+    "plus-sign floats": b"a\n+1.5\n2\n",
+}
+
+
+def check(name: str, data: bytes) -> list:
+    try:
+        expected = pd.read_csv(io.BytesIO(data), encoding="utf-8")
+    except UnicodeDecodeError:
+        expected = pd.read_csv(io.BytesIO(data), encoding="latin1")
+    problems = []
+
+    actual = read_csv(io.BytesIO(data))
+    try:
+        pd.testing.assert_frame_equal(actual, expected)
+    except AssertionError as e:
+        problems.append(f"read: {e}")
+
+    written = io.BytesIO()
+    write_csv(expected, written)
+    if written.getvalue() != expected.to_csv(index=False).encode("utf-8"):
+        problems.append("write: bytes differ from to_csv")
+
+    try:
+        arrow_csv.read_csv(data)
+        reader = "arrow"
+    except Exception:  # Unsupported, or an Arrow error on malformed input
+        reader = "pandas"
+    print(f"{'❌' if problems else '✅'} {name:<26} read by {reader}")
+    for problem in problems:
+        print(f"    {problem}")
+    return problems
+
+
+def main():
+    failures = sum(bool(check(name, data)) for name, data in CORPUS.items())
+    print(f"{len(CORPUS) - failures}/{len(CORPUS)} cases match pandas")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
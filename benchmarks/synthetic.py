@@ -0,0 +1,300 @@
+"""Seeded synthetic ERP exports, one generator per app option.
+
+Every generator takes a row count and a seed and returns a raw export with
+the column names and value spellings the converters expect: program strings
+such as ``"BSIT (2018)"``, term names, mixed birth-date formats, department
+paths from ``mappings.json`` (plus a few spellings no table knows), repeated
+and near-duplicate students, and one-way and reverse equivalency pairs.
+Values are drawn column by column with numpy, so a million rows take seconds.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SURNAMES = ["Dela Cruz", "Santos", "Reyes", "Garcia", "Mendoza", "Bautista", "Ocampo", "Villanueva",
+            "De la Rosa", "Torres", "Aquino", "Castillo", "Ramos", "Navarro", "Pascual", "Salazar",
+            "Manalo", "Gonzales", "Fernandez", "Lim", "Tan", "Sy", "Domingo", "Soriano"]
+GIVEN = ["Maria", "Juan", "Jose", "Ana", "Mark", "Angela", "Paolo", "Kristine", "John Paul", "Mary Grace",
+         "Christian", "Nicole", "Carlo", "Patricia", "Miguel", "Andrea", "Rafael", "Camille", "José", "Niño"]
+UNDERGRAD_PROGRAMS = ["BSIT", "BSCS", "BSA", "BSN", "BSPSY", "ABCOMM", "BSBA", "BSARCH", "BSED", "BSTM"]
+GRADUATE_PROGRAMS = ["MBA", "MAED", "JD", "MAPSY", "TCP", "MSIT", "PHDED", "SUPPLEMENTAL"]
+REVISIONS = ["2016", "2018", "2021", "2023"]
+TERMS = ["First Semester", "Second Semester", "Summer"]
+ACADEMIC_YEARS = [f"{y}-{y + 1}" for y in range(2016, 2025)]
+UNDERGRAD_GRADES = ["1.00", "1.25", "1.50", "1.75", "2.00", "2.25", "2.50", "2.75", "3.00", "5.00",
+                    "P", "F", "AW", "IP", "INC"]
+UNDERGRAD_WEIGHTS = [4, 8, 12, 14, 14, 12, 10, 7, 5, 4, 3, 1, 3, 2, 1]
+GRADUATE_GRADES = ["1", "1.25", "1.5", "1.75", "2", "2.5", "3", "5", "A", "A-", "B+", "PASS", "FAIL", "AW", "IP"]
+GRADUATE_WEIGHTS = [5, 10, 14, 14, 12, 8, 5, 3, 6, 5, 5, 6, 1, 3, 3]
+SCHOOLS = ["Far Eastern University", "University of the Philippines", "Ateneo de Manila University",
+           "De La Salle University", "University of Santo Tomas", ""]
+PLACES = ["manila", "quezon city", "CEBU CITY", "davao city", "las piñas", "san jose del monte", "makati"]
+LANGUAGES = ["tagalog", "english", "FILIPINO", "cebuano", "ilocano", "english, tagalog", ""]
+RELATIONS = ["mother", "Father", "GUARDIAN", "aunt", "grandmother", "uncle 2", ""]
+TITLES = ["mr", "Mr.", "MS", "ms.", "m s", "Mrs.", "Mister", ""]
+YES_NO = ["Yes", "No", "YES", "no", ""]
+# Rarer surnames built from syllables, so names are about as varied as a real roll
+SURNAME_POOL = SURNAMES + [a + b + c for a in ["Ma", "Na", "Sa", "Ca", "Ba", "Da", "Ga", "La", "Pa", "Ra", "Ta",
+                                               "Vi", "Qui", "Lo", "Mi", "Es", "Al", "Be"]
+                           for b in ["la", "na", "ri", "to", "sa", "yo", "gu", "ba", "ña", "co", "ne", "ro"]
+                           for c in ["n", "s", "z", "no", "to", "da", "ga", "les", "rez", ""]]
+# Common surnames first, then a long tail
+SURNAME_WEIGHTS = 1 / (1 + np.arange(len(SURNAME_POOL))) ** 0.7
+# Share of department values that match no mapping, as in real exports
+UNKNOWN_SHARE = 0.01
+
+
+def _weights(values, weights=None):
+    if weights is None:
+        return None
+    weights = np.asarray(weights, dtype=float)
+    assert len(weights) == len(values)
+    return weights / weights.sum()
+
+
+def _pick(rng, values, n, weights=None) -> np.ndarray:
+    """``n`` values drawn from ``values`` as an object array."""
+    return np.asarray(values, dtype=object)[rng.choice(len(values), n, p=_weights(values, weights))]
+
+
+def _numbered(prefix: str, numbers, width: int) -> np.ndarray:
+    """``prefix`` followed by each number zero-padded to ``width`` digits."""
+    digits = np.char.zfill(np.asarray(numbers).astype(str), width)
+    return np.char.add(prefix, digits).astype(object)
+
+
+def _mapping_spellings(name: str) -> list:
+    """Every raw ERP spelling of a ``mappings.json`` table."""
+    with open(os.path.join(ROOT, "mappings.json"), encoding="utf-8") as f:
+        table = json.load(f)[name]
+    return [spelling for spellings in table["values"].values() for spelling in spellings]
+
+
+def _departments(rng, name: str, n: int, unknown: str) -> np.ndarray:
+    """Department values of table ``name``, in varying case and spacing, some unknown."""
+    known = _mapping_spellings(name)
+    variants = known + [s.lower() for s in known] + [f" {s}  " for s in known]
+    values = _pick(rng, variants, n)
+    values[rng.random(n) < UNKNOWN_SHARE] = unknown
+    return values
+
+
+def _birth_dates(rng, n: int) -> np.ndarray:
+    """Birth dates spelled the way SIS exports mix them, with a few blanks."""
+    days = pd.date_range("1995-01-01", periods=4400, freq="D")
+    spellings = np.stack([days.strftime(f).to_numpy(dtype=object)
+                          for f in ("%m/%d/%Y", "%Y-%m-%d", "%d-%b-%Y", "%B %d, %Y")])
+    dates = spellings[rng.choice(4, n, p=[0.6, 0.25, 0.1, 0.05]), rng.integers(0, len(days), n)]
+    dates[rng.random(n) < 0.005] = ""
+    return dates
+
+
+def _program_revisions(rng, programs, n: int) -> np.ndarray:
+    """``"BSIT (2018)"`` style program strings."""
+    labels = [f"{program} ({revision})" for program in programs for revision in REVISIONS]
+    return _pick(rng, labels, n)
+
+
+def _student_numbers(rng, n: int) -> np.ndarray:
+    return _numbered("20", rng.integers(16, 25, n) * 10**6 + rng.integers(0, 10**6, n), 8)
+
+
+def _names(rng, n: int) -> dict:
+    first = _pick(rng, GIVEN, n)
+    second = rng.random(n) < 0.4
+    first[second] = first[second] + " " + _pick(rng, GIVEN, int(second.sum()))
+    middle = _pick(rng, SURNAME_POOL, n, SURNAME_WEIGHTS)
+    middle[rng.random(n) < 0.05] = ""
+    last = _pick(rng, SURNAME_POOL, n, SURNAME_WEIGHTS)
+    return {"First Name": first, "Middle Name": middle, "Last Name": last}
+
+
+def make_programs(n: int, seed: int = 0, courses_per_revision: int = 60) -> pd.DataFrame:
+    """Curriculum rows: ``courses_per_revision`` courses per program revision."""
+    rng = np.random.default_rng(seed)
+    row = np.arange(n)
+    curriculum, position = row // courses_per_revision, row % courses_per_revision
+    base = np.asarray(UNDERGRAD_PROGRAMS, dtype=object)[curriculum % len(UNDERGRAD_PROGRAMS)]
+    code = base + _numbered("", curriculum // len(UNDERGRAD_PROGRAMS) // len(REVISIONS), 2)
+    revision = np.asarray(REVISIONS, dtype=object)[curriculum // len(UNDERGRAD_PROGRAMS) % len(REVISIONS)]
+    course_prefix = np.char.add(code.astype(str), "-").astype(object)
+    course = course_prefix + _numbered("", position, 3)
+
+    # Up to two prerequisites from earlier in the curriculum, sometimes a later one
+    back = position - rng.integers(1, 12, n)
+    first_prereq = np.where(back >= 0, course_prefix + _numbered("", np.maximum(back, 0), 3), "")
+    later = course_prefix + _numbered("", np.minimum(position + 3, courses_per_revision - 1), 3)
+    second = np.where(rng.random(n) < 0.03, ", " + later, "")
+    prerequisite = np.where(rng.random(n) < 0.6, first_prereq + np.where(first_prereq != "", second, ""), "")
+
+    # A few electives with ABC1234 codes, which the converter removes
+    elective = rng.random(n) < 0.05
+    course = np.where(elective & (rng.random(n) < 0.5), _numbered("ELE", rng.integers(0, 10**4, n), 4), course)
+    return pd.DataFrame({
+        "Program Code": code,
+        "Description": "Bachelor of Science in " + base,
+        "Institute Code": _departments(rng, "program_institutes", n, "ACADEMIC : INST. OF NEW PROGRAMS"),
+        "Revision ID": "REV " + revision,
+        "Academic Year": _numbered("Year ", position * 4 // courses_per_revision + 1, 1),
+        "Term": np.asarray(["FIRST SEMESTER", "SECOND SEMESTER", "SUMMER"], dtype=object)[position % 3],
+        "Type": np.where(elective, "Elective", "Core").astype(object),
+        "Course": course,
+        "Prerequisite": prerequisite.astype(object),
+    })
+
+
+def _grade_rows(rng, n: int, programs, grades, weights) -> dict:
+    program = _program_revisions(rng, programs, n)
+    current = program.copy()
+    shifted = rng.random(n) < 0.1  # students who changed program or revision
+    current[shifted] = _program_revisions(rng, programs, int(shifted.sum()))
+    return {
+        "Student Number": _student_numbers(rng, n),
+        "Course Code": _numbered("CC", rng.integers(0, 3000, n), 4),
+        "Grade": _pick(rng, grades, n, weights),
+        "Academic Year": _pick(rng, ACADEMIC_YEARS, n),
+        "Academic Term": _pick(rng, TERMS, n, [45, 45, 10]),
+        "Program": program,
+        "Current Program": current,
+        "Credited": _pick(rng, ["", "YES", "NO"], n, [80, 10, 10]),
+        "Grade Point": _pick(rng, ["", "3", "1.5"], n),
+    }
+
+
+def make_grades(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(_grade_rows(rng, n, UNDERGRAD_PROGRAMS, UNDERGRAD_GRADES, UNDERGRAD_WEIGHTS))
+
+
+def make_graduate_grades(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    rows = _grade_rows(rng, n, GRADUATE_PROGRAMS, GRADUATE_GRADES, GRADUATE_WEIGHTS)
+    rows["School Name"] = _pick(rng, SCHOOLS, n)
+    return pd.DataFrame(rows)
+
+
+def make_courses(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Course Code": _numbered("CC", np.arange(n), 7),
+        "Display Name": _pick(rng, ["Purposive Communication", "Data Structures", "Accounting 1",
+                                    "Anatomy and Physiology", "Art Appreciation", "Ethics"], n),
+        "Department Code": _departments(rng, "course_departments", n, "ACADEMIC : INST. OF NEW PROGRAMS : NEW"),
+        "Units": _pick(rng, ["3", "2", "1", "5"], n, [70, 15, 10, 5]),
+        "Grading Type": _pick(rng, ["NUMERIC", "PASS/FAIL"], n, [95, 5]),
+    })
+
+
+def make_students(n: int, seed: int = 0) -> pd.DataFrame:
+    """SIS / Students export: repeated rows and near-duplicate students included."""
+    rng = np.random.default_rng(seed)
+    numbers = _student_numbers(rng, n)
+    df = pd.DataFrame({
+        "Student Number": numbers,
+        "ID": numbers,
+        **_names(rng, n),
+        "Date of Birth": _birth_dates(rng, n),
+        "Gender": _pick(rng, ["Male", "Female", "MALE", "female"], n),
+        "Email": np.char.add(numbers.astype(str), "@fit.edu.ph").astype(object),
+        "Intended Academic Year": _pick(rng, ACADEMIC_YEARS, n),
+        "Intended Academic Term": _pick(rng, ["First Semester", "Second Semester", "Third Semester"], n, [80, 15, 5]),
+        "Freshman when Admitted": _pick(rng, ["Yes", "No"], n, [85, 15]),
+        "Program": _pick(rng, UNDERGRAD_PROGRAMS, n),
+        "Revision": "REV " + _pick(rng, REVISIONS, n),
+    })
+
+    # Re-uploaded students under the same number, some with an edited cell
+    repeated = rng.choice(n, n // 50, replace=False)
+    df.iloc[repeated[: len(repeated) // 2]] = df.iloc[repeated[len(repeated) // 2:]].to_numpy()
+    edited = repeated[: len(repeated) // 4]
+    df.iloc[edited, df.columns.get_loc("Gender")] = "Female"
+
+    # The same person under a second number, with a typo in the surname
+    twins = rng.choice(n, n // 200, replace=False)
+    originals = rng.choice(n, len(twins), replace=False)
+    for column in ["First Name", "Middle Name", "Last Name", "Date of Birth"]:
+        df.iloc[twins, df.columns.get_loc(column)] = df[column].to_numpy()[originals]
+    df.iloc[twins, df.columns.get_loc("Last Name")] = df["Last Name"].to_numpy()[twins] + "s"
+    return df
+
+
+def make_cleaning_sis(n: int, seed: int = 0) -> pd.DataFrame:
+    """Columns read by every Cleaning SIS category."""
+    rng = np.random.default_rng(seed)
+    phones = _numbered("9", rng.integers(0, 10**9, n), 9)
+    return pd.DataFrame({
+        "Student Number": _student_numbers(rng, n),
+        **_names(rng, n),
+        "Date of Birth": _birth_dates(rng, n),
+        "Contact No.": "0" + phones,
+        "Mobile Phone": "+63 " + phones,
+        "Father Mobile": _pick(rng, ["0917-123-4567", "(0918) 765 4321", "", "N/A"], n),
+        "Mother Mobile": _pick(rng, ["0919 222 3333", "+63-920-111-2222", ""], n),
+        "Guardian Name": _pick(rng, GIVEN, n) + " " + _pick(rng, SURNAMES, n),
+        "Guardian's Contact Number": "+63 " + phones,
+        "Relation to Student": _pick(rng, RELATIONS, n),
+        "Birth Place": _pick(rng, PLACES, n),
+        "Language Spoken": _pick(rng, LANGUAGES, n),
+        "Foreign Language Spoken": _pick(rng, LANGUAGES, n),
+        "Mr./Ms.": _pick(rng, TITLES, n),
+        "Department": _departments(rng, "department_institutes", n, "OFFICE OF THE REGISTRAR"),
+        "Program": _pick(rng, UNDERGRAD_PROGRAMS + GRADUATE_PROGRAMS, n),
+        "Transferee": _pick(rng, YES_NO, n, [10, 60, 5, 20, 5]),
+        "Freshman when Admitted": _pick(rng, YES_NO, n, [60, 20, 5, 10, 5]),
+        "Freshman from SHS": _pick(rng, YES_NO, n, [50, 30, 5, 10, 5]),
+        "Freshman from HS": _pick(rng, YES_NO, n, [10, 60, 5, 20, 5]),
+        "Freshman from ALS": _pick(rng, YES_NO, n, [2, 70, 3, 20, 5]),
+        "Cross-Enrollee": _pick(rng, YES_NO, n, [2, 70, 3, 20, 5]),
+        "Graduate - Freshmen": _pick(rng, YES_NO, n, [20, 50, 5, 20, 5]),
+        "Graduate - Transferee": _pick(rng, YES_NO, n, [5, 60, 5, 25, 5]),
+    })
+
+
+def make_prerequisites(n: int, seed: int = 0, courses_per_revision: int = 60) -> pd.DataFrame:
+    programs = make_programs(n, seed, courses_per_revision)
+    position = np.arange(n) % courses_per_revision
+    return pd.DataFrame({
+        "Program Code": programs["Program Code"],
+        "Revision ID": programs["Revision ID"].str[4:],
+        "Academic Year (1, 2, 3...)": position * 4 // courses_per_revision + 1,
+        "Term (1, 2, 3...)": position % 3 + 1,
+        "Course Code (Or child elective code)": programs["Course"],
+    })
+
+
+def make_equivalency(n: int, seed: int = 0) -> pd.DataFrame:
+    """Course A / Course B pairs: most have their reverse, some are listed twice."""
+    rng = np.random.default_rng(seed)
+    n_pairs = max(n, 1)
+    catalogue = max(n // 4, 10)
+    a = rng.integers(0, catalogue, n_pairs)
+    # Equivalents sit a few codes apart in the catalogue, forming small classes
+    b = (a + rng.integers(1, 4, n_pairs)) % catalogue
+    forward = pd.DataFrame({"Course A": _numbered("CC", a, 6), "Course B": _numbered("CC", b, 6)})
+    reverse = forward.rename(columns={"Course A": "Course B", "Course B": "Course A"})
+    reverse = reverse.sample(frac=0.8, random_state=seed)
+    repeated = forward.sample(frac=0.05, random_state=seed)
+    pairs = pd.concat([forward, reverse, repeated], ignore_index=True).sample(frac=1, random_state=seed)
+    pairs = pairs.head(n).reset_index(drop=True)
+    pairs["Units"] = _pick(rng, ["3", "2", "1"], len(pairs))
+    return pairs
+
+
+# App option -> generator of its raw export
+GENERATORS = {
+    "Programs": make_programs,
+    "Grades": make_grades,
+    "Graduate Grades": make_graduate_grades,
+    "Courses": make_courses,
+    "Students": make_students,
+    "SIS": make_students,
+    "Pre-Requisites": make_prerequisites,
+    "Cleaning SIS": make_cleaning_sis,
+    "Two-way Equivalency": make_equivalency,
+    "Cleaning Equivalency": make_equivalency,
+    "Equivalence Classes": make_equivalency,
+}
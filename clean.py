@@ -1,304 +1,227 @@
+import numpy as np
 import pandas as pd
 import re
-import streamlit as st
 
-
-st.cache_data
-def personal_information(df: pd.DataFrame) -> pd.DataFrame:
-    # --- Helper Functions ---
-    def clean_contact(val):
-        if pd.isna(val) or str(val).strip() == "":
-            return ""
-        return re.sub(r'[^0-9]', '', str(val))
-
-    def format_date(date_val):
-        if pd.isna(date_val) or str(date_val).strip() == "":
-            return ""
-        try:
-            return pd.to_datetime(str(date_val), errors='coerce').strftime('%Y-%m-%d')
-        except Exception:
-            return ""
-
-    def clean_relation(val):
-        if pd.isna(val) or str(val).strip() == "":
-            return ""
-        val = re.sub(r'[^A-Za-z\s]', '', str(val))  # Remove special chars/numbers
-        return val.strip().title()
-
-    def smart_capitalize(name):
-        """Capitalize names intelligently (handles McDonald, De La Cruz, O'Connor)."""
-        if pd.isna(name) or str(name).strip() == "":
-            return ""
-        words = str(name).strip().split()
-        result = []
-        for w in words:
-            if w.lower().startswith("mc") and len(w) > 2:
-                result.append("Mc" + w[2:].capitalize())
-            elif w.lower() in ["de", "da", "del", "la", "le", "van", "von"]:
-                result.append(w.lower().capitalize())
-            elif "'" in w:  # O'Connor
-                parts = w.split("'")
-                result.append("'".join([p.capitalize() for p in parts]))
-            else:
-                result.append(w.capitalize())
-        return " ".join(result)
-
-    def normalize_title(val):
-        """Normalize Mr./Ms. column while retaining other values."""
-        if pd.isna(val) or str(val).strip() == "":
-            return ""
-        val_clean = str(val).strip().lower().replace(" ", "").replace(".", "")
-        if val_clean == "mr":
-            return "Mr."
-        elif val_clean == "ms":
-            return "Ms."
+import ui
+from dates import normalize_dates
+from mappings import get_mapping
+
+
+def apply_unique(column: pd.Series, func) -> pd.Series:
+    """Run ``func`` once per distinct value of ``column`` and broadcast the results.
+
+    Names, places and titles repeat on most rows, so this is far cheaper than
+    ``column.apply(func)`` and gives the same values.
+    """
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    results = np.array([func(value) for value in uniques], dtype=object)
+    return pd.Series(results[codes], index=column.index, name=column.name)
+
+
+def clean_contact(column: pd.Series) -> pd.Series:
+    """Keep only the digits of every contact number; blanks become ""."""
+    blank = column.isna()
+    text = column.astype(object).where(~blank, "").astype(str)
+    return text.str.replace(r'[^0-9]', '', regex=True)
+
+
+def clean_relation(val):
+    if pd.isna(val) or str(val).strip() == "":
+        return ""
+    val = re.sub(r'[^A-Za-z\s]', '', str(val))  # Remove special chars/numbers
+    return val.strip().title()
+
+
+def smart_capitalize(name):
+    """Capitalize names intelligently (handles McDonald, De La Cruz, O'Connor)."""
+    if pd.isna(name) or str(name).strip() == "":
+        return ""
+    words = str(name).strip().split()
+    result = []
+    for w in words:
+        if w.lower().startswith("mc") and len(w) > 2:
+            result.append("Mc" + w[2:].capitalize())
+        elif w.lower() in ["de", "da", "del", "la", "le", "van", "von"]:
+            result.append(w.lower().capitalize())
+        elif "'" in w:  # O'Connor
+            parts = w.split("'")
+            result.append("'".join([p.capitalize() for p in parts]))
         else:
-            return str(val).strip()  # retain original if not recognized
+            result.append(w.capitalize())
+    return " ".join(result)
+
+
+def normalize_title(val):
+    """Normalize Mr./Ms. column while retaining other values."""
+    if pd.isna(val) or str(val).strip() == "":
+        return ""
+    val_clean = str(val).strip().lower().replace(" ", "").replace(".", "")
+    if val_clean == "mr":
+        return "Mr."
+    elif val_clean == "ms":
+        return "Ms."
+    else:
+        return str(val).strip()  # retain original if not recognized
+
 
-    # --- Apply Cleaning Rules ---
+def personal_information(df: pd.DataFrame) -> pd.DataFrame:
+    # --- Apply Cleaning Rules (each cleaner runs once per distinct value) ---
     if 'Contact No.' in df.columns:
-        df['Contact No.'] = df['Contact No.'].apply(clean_contact)
+        df['Contact No.'] = clean_contact(df['Contact No.'])
 
     if 'Date of Birth' in df.columns:
-        df['Date of Birth'] = df['Date of Birth'].apply(format_date)
+        # Blank or unparseable dates become ""
+        df['Date of Birth'], report = normalize_dates(df['Date of Birth'])
+        ui.show_report(report, "Date of Birth")
 
     if "Guardian Name" in df.columns:
-        df["Guardian Name"] = df["Guardian Name"].apply(smart_capitalize)
+        df["Guardian Name"] = apply_unique(df["Guardian Name"], smart_capitalize)
 
     if "Guardian's Contact Number" in df.columns:
-        df["Guardian's Contact Number"] = df["Guardian's Contact Number"].apply(clean_contact)
+        df["Guardian's Contact Number"] = clean_contact(df["Guardian's Contact Number"])
 
     if 'Relation to Student' in df.columns:
-        df['Relation to Student'] = df['Relation to Student'].apply(clean_relation)
+        df['Relation to Student'] = apply_unique(df['Relation to Student'], clean_relation)
 
     if 'Birth Place' in df.columns:
-        df['Birth Place'] = df['Birth Place'].apply(smart_capitalize)
+        df['Birth Place'] = apply_unique(df['Birth Place'], smart_capitalize)
 
     if 'Language Spoken' in df.columns:
-        df['Language Spoken'] = df['Language Spoken'].apply(smart_capitalize)
+        df['Language Spoken'] = apply_unique(df['Language Spoken'], smart_capitalize)
 
     if 'Foreign Language Spoken' in df.columns:
-        df['Foreign Language Spoken'] = df['Foreign Language Spoken'].apply(smart_capitalize)
+        df['Foreign Language Spoken'] = apply_unique(df['Foreign Language Spoken'], smart_capitalize)
 
     if 'Mr./Ms.' in df.columns:
-        df['Mr./Ms.'] = df['Mr./Ms.'].apply(normalize_title)
+        df['Mr./Ms.'] = apply_unique(df['Mr./Ms.'], normalize_title)
 
     return df
 
 
 #institute mapping
-st.cache_data
 def insti(df: pd.DataFrame) -> pd.DataFrame:
-    mapping = {
-        "IABF": [
-            "ACCOUNTANCY",
-            "GE",
-            "HUMAN RESOURCES AND ORGANIZATIONAL DEVELOPMENT",
-            "INFORMATION TECHNOLOGY",
-            "INTERNAL AUDITING",
-            "BUSINESS ADMINISTRATION",
-            "ECONOMICS",
-            "BSA"
-        ],
-        "IARFA": [
-            "ARCHITECTURE",
-            "FINE ARTS"
-        ],
-        "IAS": [
-            "BIOLOGY",
-            "BIOLOGY DEPARTMENT",
-            "BIOLOGY GRADUATE PROGRAM",
-            "COMMUNICATION",
-            "COMMUNICATION DEPARTMENT",
-            "COMMUNICATION GRADUATE PROGRAM",
-            "ENG EDERP",
-            "FILIP EDERP",
-            "INTERDISCIPLINARY STUDIES",
-            "INTERNATIONAL STUDIES",
-            "LANGUAGE AND LITERATURE STUDIES",
-            "LANGUAGE AND LITERATURE STUDIES GRADUATE PROGRAM",
-            "LIT & HUM EDERP",
-            "MATHEMATICS",
-            "MATHEMATICS - GS",
-            "MEDTECH EDERP",
-            "POLITICAL SCIENCE",
-            "PSYCHOLOGY",
-            "PSYCHOLOGY GRADUATE PROGRAM"
-        ],
-        "IABF-MBA": ["BUSINESS ADMINISTRATION GRADUATE PROGRAM"],
-        "IE": ["EDUCATION", "EDUCATION GRADUATE PROGRAM AND TNE"],
-        "IL": ["IL/JD-MBA EDERP", "JURIS DOCTOR"],
-        "IN": ["IN - GS", "IN EDERP"],
-        "JD-MBA": ["JD-MBA"],
-        "IHSN": [
-            "MEDICAL TECHNOLOGY",
-            "MEDICAL TECHNOLOGY DEPARTMENT",
-            "NURSING",
-            "NURSING GRADUATE PROGRAM",
-            "NUTRITION AND DIETETICS",
-            "PHARMACY",
-            "Nursing Office"
-        ],
-        "ITHM": [
-            "HOTEL AND RESTAURANT MANAGEMENT",
-            "TOURISM AND HOSPITALITY MANAGEMENT GRADUATE PROGRAM",
-            "TOURISM MANAGEMENT",
-            "Tourism & HM Office"
-        ]
-    }
-
-    def institute_mapping(value):
-        value = str(value).strip().upper().replace('\xa0', ' ')
-        for inst, keywords in mapping.items():
-            if any(value == k.upper() for k in keywords):  # uppercase BOTH sides
-                return inst
-        return "Unknown"
-
-
+    # Department names per institute live in mappings.json ("department_institutes")
     if "Department" in df.columns:
-        df["Institute"] = df["Department"].apply(institute_mapping)
+        mapping = get_mapping("department_institutes")
+        df["Institute"] = mapping.map(df["Department"])
+        mapping.warn_unmatched(df["Department"], "Department")
     else:
         raise KeyError("Missing required column: 'Department'")
 
     return df
 
 
-st.cache_data
-def category_bachelor(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-
-    def get_category(row):
-        # Fetch fields safely
-        transferee = str(row.get("Transferee", "")).strip().lower()
-        freshman_admit = str(row.get("Freshman when Admitted", "")).strip().lower()
-
-        shs = str(row.get("Freshman from SHS", "")).strip().lower()
-        hs = str(row.get("Freshman from HS", "")).strip().lower()
-        als = str(row.get("Freshman from ALS", "")).strip().lower()
-
-        cross = str(row.get("Cross-Enrollee", "")).strip().lower()
-        supplemental = str(row.get("Supplemental Course", "")).strip().lower()
-        tcp = str(row.get("Teacher Certificate Program", "")).strip().lower()
-        second_deg = str(row.get("Second Degree", "")).strip().lower()
-
-        # 1️⃣ TRANSFEREE
-        if transferee == "yes":
-            return "Transferee - Undergraduate"
-
-        # 2️⃣ FRESHMAN
-        if freshman_admit == "yes":
-
-            # Priority checking for SHS / HS / ALS
-            if shs == "yes":
-                return "Freshman - Graduate from Senior High School"
-
-            if hs == "yes":
-                return "Freshman - Graduate from High School"
-
-            if als == "yes":
-                return "Freshman - Completer from ALS/PEPT"
-
-            # Default if Freshman but none is YES
-            return "Freshman - Graduate from High School"
-
-        # 3️⃣ NOT TRANSFEREE, NOT FRESHMAN → Check other categories
-        if cross == "yes":
-            return "Cross-Enrollee"
-
-        if supplemental == "yes":
-            return "Supplemental Course"
-
-        if tcp == "yes":
-            return "Teacher Certificate Program"
+# Admission categories as ordered rules: the first rule whose conditions all
+# hold names the category. A condition is (column, test, text) on the stripped
+# column value; "is" compares lower-case, "startswith" and "contains" compare
+# upper-case. A missing column reads as "".
+BACHELOR_RULES = [
+    ("Transferee - Undergraduate", [("Transferee", "is", "yes")]),
+    # Freshmen: SHS, then HS, then ALS; High School when none is YES
+    ("Freshman - Graduate from Senior High School",
+     [("Freshman when Admitted", "is", "yes"), ("Freshman from SHS", "is", "yes")]),
+    ("Freshman - Graduate from High School",
+     [("Freshman when Admitted", "is", "yes"), ("Freshman from HS", "is", "yes")]),
+    ("Freshman - Completer from ALS/PEPT",
+     [("Freshman when Admitted", "is", "yes"), ("Freshman from ALS", "is", "yes")]),
+    ("Freshman - Graduate from High School", [("Freshman when Admitted", "is", "yes")]),
+    ("Cross-Enrollee", [("Cross-Enrollee", "is", "yes")]),
+    ("Supplemental Course", [("Supplemental Course", "is", "yes")]),
+    ("Teacher Certificate Program", [("Teacher Certificate Program", "is", "yes")]),
+    ("Second Degree", [("Second Degree", "is", "yes")]),
+]
+BACHELOR_DEFAULT = "No Category found"
+
+GRADUATE_RULES = [
+    ("Transferee - Juris Doctor", [("Program", "startswith", "JD"), ("Transferee", "is", "yes")]),
+    ("Freshman - Juris Doctor", [("Program", "startswith", "JD")]),
+    ("Teacher Certificate Program", [("Program", "contains", "TCP")]),
+    ("Supplemental Course", [("Program", "contains", "SUPPLEMENTAL")]),
+    ("Freshman - Graduate Studies", [("Graduate - Freshmen", "is", "yes")]),
+    ("Transferee - Graduate Studies", [("Graduate - Transferee", "is", "yes")]),
+]
+GRADUATE_DEFAULT = "Freshman - Graduate Studies"
+
+_TESTS = {
+    "is": lambda text, value: text.str.lower() == value,
+    "startswith": lambda text, value: text.str.upper().str.startswith(value),
+    "contains": lambda text, value: text.str.upper().str.contains(value, regex=False),
+}
+
+
+def categorize(df: pd.DataFrame, rules, default: str) -> np.ndarray:
+    """The category of every row under ``rules``, evaluated column-wise with ``np.select``.
+
+    Each condition is tested on the distinct values of its column only.
+    """
+    columns = {}  # column -> (codes, stripped text of each distinct value)
+    for _, conditions in rules:
+        for column, _, _ in conditions:
+            if column in columns:
+                continue
+            if column in df.columns:
+                codes, uniques = pd.factorize(df[column], use_na_sentinel=False)
+            else:
+                codes, uniques = np.zeros(len(df), dtype=np.intp), [""]
+            columns[column] = codes, pd.Series([str(u).strip() for u in uniques], dtype=object)
 
-        if second_deg == "yes":
-            return "Second Degree"
+    masks = []
+    for _, conditions in rules:
+        mask = np.ones(len(df), dtype=bool)
+        for column, test, value in conditions:
+            codes, text = columns[column]
+            mask &= _TESTS[test](text, value).to_numpy(dtype=bool)[codes]
+        masks.append(mask)
 
-        # Nothing matched
-        return "No Category found"
+    categories = [category for category, _ in rules]
+    return np.select(masks, categories, default=default).astype(object)
 
-    # Apply the logic
-    df["category"] = df.apply(get_category, axis=1)
 
+def category_bachelor(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["category"] = categorize(df, BACHELOR_RULES, BACHELOR_DEFAULT)
     return df
 
-st.cache_data
+
 def category_graduate(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
+    df["category"] = categorize(df, GRADUATE_RULES, GRADUATE_DEFAULT)
+    return df
 
-    def get_grad_category(row):
-        program = str(row.get("Program", "")).strip().upper()
-        transferee = str(row.get("Transferee", "")).strip().lower()
-        grad_freshman = str(row.get("Graduate - Freshmen", "")).strip().lower()
-        grad_transferee = str(row.get("Graduate - Transferee", "")).strip().lower()
-
-        # 1️⃣ JD PROGRAM CHECK
-        if program.startswith("JD"):
-            if transferee == "yes":
-                return "Transferee - Juris Doctor"
-            else:
-                return "Freshman - Juris Doctor"
 
-        # 2️⃣ TCP PROGRAM CHECK
-        if "TCP" in program:
-            return "Teacher Certificate Program"
+def clean_title(val):
+    """Mr./Ms. for anything starting with either, keeping other values as they are."""
+    if pd.isna(val) or str(val).strip() == "":
+        return ""  # leave blank as is
 
-        # 3️⃣ SUPPLEMENTAL PROGRAM CHECK
-        if "SUPPLEMENTAL" in program:
-            return "Supplemental Course"
+    raw = str(val).strip()
 
-        # 4️⃣ GENERAL GRADUATE STUDIES CHECK  
-        if grad_freshman == "yes":
-            return "Freshman - Graduate Studies"
+    # Normalize the raw text (remove spaces and dots for checking)
+    normalized = raw.lower().replace(".", "").replace(" ", "")
 
-        if grad_transferee == "yes":
-            return "Transferee - Graduate Studies"
+    # Check if it contains MR or MS
+    if normalized.startswith("mr"):
+        return "Mr."
+    if normalized.startswith("ms"):
+        return "Ms."
 
-        # 5️⃣ DEFAULT FOR GRADUATE STUDIES
-        return "Freshman - Graduate Studies"
+    # Otherwise keep value as is
+    return raw
 
-    df["category"] = df.apply(get_grad_category, axis=1)
-    return df
 
-st.cache_data
 def mob_mr_ms(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
 
-    # ----------------- Helper: Normalize Mr./Ms. -----------------
-    def clean_title(val):
-        if pd.isna(val) or str(val).strip() == "":
-            return ""  # leave blank as is
-
-        raw = str(val).strip()
-
-        # Normalize the raw text (remove spaces and dots for checking)
-        normalized = raw.lower().replace(".", "").replace(" ", "")
-
-        # Check if it contains MR or MS
-        if normalized.startswith("mr"):
-            return "Mr."
-        if normalized.startswith("ms"):
-            return "Ms."
-
-        # Otherwise keep value as is
-        return raw
-
-    # ----------------- Helper: Clean mobile contact fields -----------------
-    def clean_mobile(val):
-        if pd.isna(val) or str(val).strip() == "":
-            return ""  # leave blank
-        return re.sub(r'[^0-9]', '', str(val))
-
     # Apply to Mr./Ms.
     if "Mr./Ms." in df.columns:
-        df["Mr./Ms."] = df["Mr./Ms."].apply(clean_title)
+        df["Mr./Ms."] = apply_unique(df["Mr./Ms."], clean_title)
 
     # Columns to clean
     mobile_columns = ["Mobile Phone", "Father Mobile", "Mother Mobile"]
 
     for col in mobile_columns:
         if col in df.columns:
-            df[col] = df[col].apply(clean_mobile)
+            df[col] = clean_contact(df[col])
 
     return df
 
@@ -1,45 +1,60 @@
+from functools import partial
+
+import numpy as np
 import pandas as pd
-import streamlit as st
+import ui
+from course_equivalency import pair_codes
+
+
+def reverse_duplicate_masks(df: pd.DataFrame):
+    """``(kept, dropped)`` row masks: a row is dropped when its pair already appeared in either order."""
+    a, b, courses = pair_codes(df)
+    # Order-independent key: the smaller code first
+    key = np.minimum(a, b) * len(courses) + np.maximum(a, b)
+    dropped = pd.Series(key).duplicated().to_numpy()
+    return ~dropped, dropped
+
+
+def _remove_dropped(df: pd.DataFrame, kept: np.ndarray) -> pd.DataFrame:
+    """The confirmed result: ``df`` without the dropped rows."""
+    df = df[kept]
+    ui.success("Reverse duplicates removed.")
+
+    ui.subheader("Cleaned Data (Unique Two-Way Pairs)")
+    ui.dataframe(df)
+    return df
 
-st.cache_data
-def remove_reverse_duplicates(df: pd.DataFrame) -> pd.DataFrame:
+
+def remove_reverse_duplicates(df: pd.DataFrame, confirm=None) -> pd.DataFrame:
+    """Drop rows whose (Course A, Course B) pair already appeared in either order.
+
+    ``confirm=None`` asks with a Streamlit button; ``True``/``False`` decide
+    up front (used by headless runs, where the button is never clicked).
+    """
     df = df.copy()
 
     required_cols = ["Course A", "Course B"]
     for col in required_cols:
         if col not in df.columns:
-            st.error(f"Missing required column: {col}")
+            ui.error(f"Missing required column: {col}")
             return df
 
-    seen = set()
-    drop_indices = []
-
-    for idx, row in df.iterrows():
-        a, b = row["Course A"], row["Course B"]
-        key = tuple(sorted([a, b]))  # order-independent key
-
-        if key in seen:
-            drop_indices.append(idx)  # duplicate pair → drop this row
-        else:
-            seen.add(key)
+    kept, dropped = reverse_duplicate_masks(df)
 
     # Show duplicates first for confirmation
-    if drop_indices:
-        st.warning("⚠️ These rows are REVERSE duplicates and can be removed:")
-        st.dataframe(df.loc[drop_indices])
-
-        if st.button("🗑 Remove reverse duplicates"):
-            df = df.drop(index=drop_indices)
-            st.success("Reverse duplicates removed.")
+    if dropped.any():
+        ui.warning("⚠️ These rows are REVERSE duplicates and can be removed:")
+        ui.dataframe(df[dropped])
 
-            st.subheader("Cleaned Data (Unique Two-Way Pairs)")
-            st.dataframe(df)
+        if confirm or (confirm is None and ui.button("🗑 Remove reverse duplicates")):
+            df = _remove_dropped(df, kept)
         else:
-            st.info("No changes made yet.")
-            st.stop()
+            ui.info("No changes made yet.")
+            # The cache applies the mask on the click instead of converting again
+            ui.stop(confirmed=partial(_remove_dropped, df, kept))
 
     else:
-        st.success("No reverse duplicates found.")
-        st.dataframe(df)
+        ui.success("No reverse duplicates found.")
+        ui.dataframe(df)
 
     return df
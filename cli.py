@@ -0,0 +1,117 @@
+"""Convert many raw ERP CSV exports without the browser.
+
+Every input file is converted in its own worker process and written to
+``<out>/<input name>/<file name the app would use>``:
+
+    python cli.py Grades "exports/grades_*.csv" --out converted --workers 8
+    python cli.py "Cleaning SIS" exports/ --category Institute
+"""
+import argparse
+import glob
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import ui
+from conversions import OPTIONS, CATEGORIES, get_conversion, read_csv
+from exports import FORMATS, export_name, write_export
+
+
+def expand_inputs(pattern: str) -> list:
+    """A directory means every ``*.csv`` inside it; anything else is a glob."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.csv")
+    return sorted(glob.glob(pattern))
+
+
+def convert_file(option, category, path, out_dir, confirm=None, fmt="CSV"):
+    """Convert one CSV and return ``(output path, input rows, seconds)``.
+
+    Validation failures, if any, are written to ``errors.csv`` next to the output.
+    """
+    conversion = get_conversion(option, category)
+    start = time.perf_counter()
+
+    df = read_csv(path, conversion.schema)
+    converted_df, report = conversion.run(df, confirm=confirm)
+
+    target_dir = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0])
+    os.makedirs(target_dir, exist_ok=True)
+    output_path = os.path.join(target_dir, export_name(conversion.file_name, fmt))
+    with open(output_path, "wb") as f:
+        write_export(converted_df, fmt, conversion.file_name, f)
+
+    if report is not None:
+        report.show()
+        if report.failed.any():
+            report.to_csv(os.path.join(target_dir, "errors.csv"))
+
+    return output_path, len(df), time.perf_counter() - start
+
+
+def _init_worker(level):
+    logging.basicConfig(level=level, format="%(processName)s %(levelname)s %(message)s")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Batch ERP → Edusuite CSV converter.")
+    parser.add_argument("type", choices=OPTIONS, help="conversion type, as in the app")
+    parser.add_argument("inputs", help="directory of CSV files or a glob such as 'exports/*.csv'")
+    parser.add_argument("--category", help="sub-category for " + " / ".join(CATEGORIES) + " ("
+                        + "; ".join(f"{k}: {', '.join(v)}" for k, v in CATEGORIES.items()) + ")")
+    parser.add_argument("--out", default="converted", help="output directory (default: converted)")
+    parser.add_argument("--format", choices=FORMATS, default="CSV", help="output format (default: CSV)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--confirm", action="store_true",
+                        help="apply row changes that the app asks to confirm (equivalency clean-ups)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show converter messages")
+    args = parser.parse_args(argv)
+
+    try:
+        get_conversion(args.type, args.category)
+    except KeyError as e:
+        parser.error(e.args[0])
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error(f"no CSV files match {args.inputs!r}")
+
+    level = logging.INFO if args.verbose else logging.WARNING
+    _init_worker(level)
+
+    failures = 0
+    total_rows = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(level,)) as pool:
+        futures = {
+            pool.submit(convert_file, args.type, args.category, path, args.out, args.confirm, args.format): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                output_path, rows, elapsed = future.result()
+            except ui.StopRequested as e:
+                failures += 1
+                print(f"❌ {path}: {e}; nothing was written (pass --confirm to apply the changes)", file=sys.stderr)
+                continue
+            except Exception as e:
+                failures += 1
+                print(f"❌ {path}: {type(e).__name__}: {e}", file=sys.stderr)
+                continue
+
+            total_rows += rows
+            print(f"✅ {path} → {output_path}: {rows:,} rows in {elapsed:.2f}s "
+                  f"({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths) - failures}/{len(paths)} files, {total_rows:,} rows in {elapsed:.2f}s "
+          f"({total_rows / max(elapsed, 1e-9):,.0f} rows/s overall)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
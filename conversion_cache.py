@@ -0,0 +1,295 @@
+"""Content-addressed caches of parsed uploads and finished conversions.
+
+:class:`UploadCache` keeps each upload's parsed frame by content digest, in
+memory and as a memory-mapped Feather (Arrow IPC) file on local disk, so the
+CSV is parsed once per file content and ingest schema rather than once per
+rerun or session.
+
+:class:`ConversionCache` entries are keyed by the upload's content digest plus
+the conversion option, its sub-category and the state of any confirmation
+button, so re-clicking a widget, switching back to an earlier option or
+confirming a removal is served without converting again. The messages the converter emitted are recorded
+with the result and replayed on a hit. Files on disk are also keyed by a
+fingerprint of the source, so a deploy never serves the previous code's output.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from functools import partial
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+import ui
+from grading import ValidationReport
+
+log = logging.getLogger("feuploader")
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB
+DEFAULT_MAX_DISK_BYTES = 8 * 1024 * 1024 * 1024  # 8 GiB
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+# The code that turns an upload's bytes into the cached frame
+READER_FILES = ("arrow_csv.py", "conversions.py")
+# Everything a conversion result can depend on: every module and the mappings
+CONVERTER_FILES = tuple(name for name in os.listdir(SOURCE_DIR)
+                        if name.endswith(".py") or name == "mappings.json")
+
+
+def source_fingerprint(files) -> str:
+    """Short id of the given source files and the pandas and pyarrow versions.
+
+    Part of every disk cache key, so files written by other code (an older
+    deploy, another pandas) are never read back as if this code made them.
+    """
+    digest = hashlib.blake2b(f"{pd.__version__}/{pa.__version__}".encode(), digest_size=6)
+    for name in sorted(files):
+        with open(os.path.join(SOURCE_DIR, name), "rb") as f:
+            digest.update(name.encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+
+def content_digest(data: bytes) -> str:
+    """Digest identifying an upload by its bytes, whatever the file name."""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def _estimate_size(value) -> int:
+    """Approximate resident size of a cached entry (frames dominate)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(v) for v in value)
+    if isinstance(value, partial):  # a confirmation holding the unconfirmed frame
+        return _estimate_size(list(value.args))
+    if isinstance(value, ValidationReport):  # shares the converted frame
+        return sum(mask.nbytes for mask in value.masks.values())
+    return 64
+
+
+class MemoryLRU:
+    """Least-recently-used mapping bounded by the estimated size of its values."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            # Evict least recently used entries until we fit again
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+
+class ConversionCache:
+    """LRU cache bounded by memory, with an optional pickle tier on disk.
+
+    Each entry is ``(converted frame, validation report, messages, stopped)``,
+    where ``stopped`` means the converter asked to stop the script (it is
+    waiting for a confirmation) and there is no result to show yet. A stopped
+    entry holds the ``confirmed`` callable passed to ``ui.stop`` in place of
+    the frame.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, disk_dir: str = None):
+        self.memory = MemoryLRU(max_bytes)
+        self.disk_dir = disk_dir
+        self.version = source_fingerprint(CONVERTER_FILES)
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def run(self, key: tuple, conversion, df_loader, unconfirmed_key: tuple = None):
+        """Return the cached entry for ``key``, converting ``df_loader()`` on a miss.
+
+        The converter's messages are shown live on a miss and replayed on a hit,
+        including a request to stop the script while waiting for confirmation.
+        ``unconfirmed_key`` is the key of the same conversion with no button
+        clicked: when that run stopped for the button that is now clicked, its
+        confirmation is applied instead of converting again.
+        """
+        entry = self._get(key)
+        if entry is not None:
+            ui.replay(entry[2])
+            return entry
+
+        if unconfirmed_key is not None and unconfirmed_key != key:
+            entry = self._confirm(key, conversion, unconfirmed_key)
+            if entry is not None:
+                return entry
+
+        with ui.recording() as messages:
+            try:
+                converted_df, report = conversion.run(df_loader())
+                stopped = False
+            except ui.StopRequested as e:
+                converted_df, report, stopped = e.confirmed, None, True
+
+        entry = (converted_df, report, list(messages), stopped)
+        self.memory.put(key, entry)
+        self._store(key, entry)
+        if stopped:
+            ui.stop()
+        return entry
+
+    def _confirm(self, key, conversion, unconfirmed_key):
+        """Finish the stopped run of ``unconfirmed_key`` now that its button was clicked."""
+        stopped = self._get(unconfirmed_key)
+        if stopped is None or not stopped[3] or stopped[0] is None:
+            return None
+        messages = stopped[2]
+        buttons = [i for i, (name, _) in enumerate(messages) if name == "button"]
+        if not buttons or messages[buttons[-1]][1][0] not in ui.clicked_buttons():
+            return None
+
+        # What the converter showed up to its button, then the confirmed branch
+        with ui.recording() as recorded:
+            ui.replay(messages[:buttons[-1] + 1])
+            converted_df = stopped[0]()
+            report = conversion.validate(converted_df) if conversion.validate is not None else None
+
+        entry = (converted_df, report, list(recorded), False)
+        self.memory.put(key, entry)
+        self._store(key, entry)
+        return entry
+
+    def _get(self, key):
+        entry = self.memory.get(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self.memory.put(key, entry)
+        return entry
+
+    # -------------------- DISK TIER --------------------
+    def _path(self, key):
+        # Results pickled by other code are never read back as this code's
+        name = hashlib.blake2b(repr((self.version, key)).encode(), digest_size=20).hexdigest()
+        return os.path.join(self.disk_dir, f"{name}.pkl")
+
+    def _load(self, key):
+        if not self.disk_dir or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except Exception as e:  # a corrupt or incompatible file is just a miss
+            log.warning("Ignoring unreadable cache file %s: %s", self._path(key), e)
+            return None
+
+    def _store(self, key, entry):
+        if not self.disk_dir:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+
+class UploadCache:
+    """Parsed uploads by content digest: a memory LRU over a Feather file tier.
+
+    A disk hit memory-maps the Feather file, so loading a parsed upload costs
+    about as much as opening a file, whichever session parsed it first.
+    Callers get a shallow copy and may add or replace columns freely.
+    """
+
+    def __init__(self, disk_dir: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        self.memory = MemoryLRU(max_bytes)
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.version = source_fingerprint(READER_FILES)
+        os.makedirs(disk_dir, exist_ok=True)
+
+    def load(self, key: str, parse) -> pd.DataFrame:
+        """Return the frame for ``key``, calling ``parse()`` only if it is not cached.
+
+        ``key`` is the upload's content digest, extended with anything else
+        that changes how it is parsed (see ``IngestSchema.fingerprint``). The
+        disk tier adds the reader's own fingerprint, so a change to the CSV
+        reader or the library versions parses uploads afresh.
+        """
+        df = self.memory.get(key)
+        if df is None:
+            df = self._load(key)
+            if df is None:
+                df = parse()
+                self._store(key, df)
+            self.memory.put(key, df)
+        return df.copy(deep=False)
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}-{self.version}.feather")
+
+    def _load(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            table = feather.read_table(path, memory_map=True)
+            os.utime(path)  # recently used files are pruned last
+            return table.to_pandas(split_blocks=True)
+        except Exception as e:  # a corrupt or incompatible file is just a miss
+            log.warning("Ignoring unreadable upload cache file %s: %s", path, e)
+            return None
+
+    def _store(self, key, df):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            # Uncompressed, so a later read can map the columns instead of copying them
+            feather.write_feather(df, tmp, compression="uncompressed")
+        except (pa.ArrowException, ValueError) as e:
+            # e.g. a column mixing numbers and text; such uploads stay memory-only
+            log.info("Not caching upload %s on disk: %s", key, e)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        os.replace(tmp, path)
+        self._prune()
+
+    def _prune(self):
+        """Delete the least recently used files beyond ``max_disk_bytes``."""
+        files = []
+        with os.scandir(self.disk_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".feather"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
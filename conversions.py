@@ -0,0 +1,288 @@
+"""Conversion types offered by the app, shared with the headless batch CLI."""
+import hashlib
+import io
+import logging
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Optional
+
+import arrow_csv
+import courses
+import programs
+import students
+from programs import convert_programs
+from grades import convert_grades
+from grading import OUTPUT_COLUMNS as GRADE_COLUMNS, build_validation_report
+from graduate_grades import check_graduate_grades
+from courses import convert_courses
+from course_equivalency import two_way_course_equivalency
+from cleaning_equivalency import remove_reverse_duplicates
+from equivalence_classes import equivalence_classes
+from students import convert_students
+from sis import find_duplicate_differences, find_near_duplicates, check_fields
+from pre_req import check_prerequisites
+from clean import personal_information, insti, category_bachelor, category_graduate, mob_mr_ms
+
+log = logging.getLogger("feuploader")
+
+
+@dataclass(frozen=True)
+class IngestSchema:
+    """The upload columns a converter reads, so everything else is never parsed."""
+    # Columns the converter cannot work without
+    required: tuple
+    # Columns read when present, e.g. passed through to the output
+    optional: tuple = ()
+    # Low-cardinality columns read as category: one copy of each distinct string
+    categories: tuple = ()
+    # Also read every column whose lower-cased name contains all of these words
+    name_words: tuple = ()
+    # The converter passes every upload column through: read them all
+    passthrough: bool = False
+
+    def keeps(self, column: str) -> bool:
+        if self.passthrough or column in self.required or column in self.optional:
+            return True
+        return bool(self.name_words) and all(w in column.lower() for w in self.name_words)
+
+    @property
+    def usecols(self):
+        """``pd.read_csv(usecols=...)`` selecting this schema's columns."""
+        return None if self.passthrough else self.keeps
+
+    def read_options(self) -> dict:
+        return {"usecols": self.usecols, "dtype": {col: "category" for col in self.categories}}
+
+    def check(self, df: pd.DataFrame):
+        missing = [col for col in self.required if col not in df.columns]
+        if missing:
+            raise KeyError(f"Missing required column(s): {', '.join(map(repr, missing))}")
+
+    def fingerprint(self) -> str:
+        """Short stable id of this schema, for caching frames parsed with it."""
+        return hashlib.blake2b(repr(self).encode(), digest_size=6).hexdigest()
+
+
+GRADES_SCHEMA = IngestSchema(
+    required=("Grade", "Academic Year", "Academic Term", "Program"),
+    optional=tuple(GRADE_COLUMNS),
+    categories=("Grade", "Academic Year", "Academic Term", "Program"),
+)
+
+GRADUATE_GRADES_SCHEMA = IngestSchema(
+    required=GRADES_SCHEMA.required,
+    optional=GRADES_SCHEMA.optional,
+    categories=GRADES_SCHEMA.categories,
+    name_words=("school", "name"),  # the School Name lookup in grading.py
+)
+
+STUDENTS_SCHEMA = IngestSchema(
+    required=("Date of Birth", "Gender", "Intended Academic Year", "Intended Academic Term",
+              "Freshman when Admitted", "Program", "Revision"),
+    optional=("Email", "ID", *students.FINAL_COLUMNS),
+    categories=("Gender", "Program"),
+)
+
+COURSES_SCHEMA = IngestSchema(
+    required=("Department Code",),
+    optional=(*courses.COLUMN_MAPPING, *courses.COLUMN_MAPPING.values()),
+    categories=("Department Code",),
+)
+
+INSTITUTE_SCHEMA = IngestSchema(required=("Department",), categories=("Department",), passthrough=True)
+
+PROGRAMS_SCHEMA = IngestSchema(
+    required=("Program Code", "Revision ID", "Academic Year", "Term", "Institute Code", "Course", "Prerequisite"),
+    optional=("Type", *programs.COLUMN_MAPPING, *programs.COLUMN_MAPPING.values()),
+    categories=("Institute Code",),
+)
+
+
+@dataclass(frozen=True)
+class Conversion:
+    convert: Callable[[pd.DataFrame], pd.DataFrame]
+    file_name: str
+    # Each output row depends only on its input row, so the file can be streamed in chunks
+    row_local: bool = False
+    # Builds the ValidationReport of a converted frame (see grading.build_validation_report)
+    validate: Optional[Callable[[pd.DataFrame], object]] = None
+    # The converter asks before dropping rows and accepts confirm=True/False
+    confirmable: bool = False
+    # Columns and dtypes to read; None reads every column, as the converter keeps them all
+    schema: Optional[IngestSchema] = None
+
+    def chunk_converter(self):
+        """Converter that leaves validation to the caller (``self.validate``)."""
+        if self.validate is not None:
+            return partial(self.convert, validate=False)
+        return self.convert
+
+    def run(self, df: pd.DataFrame, confirm=None):
+        """Convert ``df`` and return ``(converted frame, validation report or None)``."""
+        convert = self.chunk_converter()
+        if self.confirmable:
+            convert = partial(convert, confirm=confirm)
+
+        converted_df = convert(df)
+        report = self.validate(converted_df) if self.validate is not None else None
+        return converted_df, report
+
+
+def _sis_select_all(df: pd.DataFrame) -> pd.DataFrame:
+    find_duplicate_differences(df)
+    return convert_students(df)
+
+
+OPTIONS = [
+    "Programs",
+    "Grades",
+    "Graduate Grades",
+    "Courses",
+    "Students",
+    "SIS",
+    "Pre-Requisites",
+    "Cleaning SIS",
+    "Two-way Equivalency",
+    "Cleaning Equivalency",
+    "Equivalence Classes",
+]
+
+CATEGORIES = {
+    "SIS": ["Check for duplicates", "Check for near-duplicates", "Convert only", "Check Name Fields", "Select All"],
+    "Two-way Equivalency": ["Remove one-way rows", "Add missing reverse rows"],
+    "Cleaning SIS": ["Personal Information", "Institute", "Category Undergrad", "Category Graduate", "Mobile Phone and Mr./Ms."],
+}
+
+CONVERSIONS = {
+    ("Programs", None): Conversion(convert_programs, "converted_programs.csv", schema=PROGRAMS_SCHEMA),
+    ("Grades", None): Conversion(convert_grades, "converted_grades.csv", True, build_validation_report,
+                                 schema=GRADES_SCHEMA),
+    ("Graduate Grades", None): Conversion(check_graduate_grades, "graduate_grades.csv", True, build_validation_report,
+                                          schema=GRADUATE_GRADES_SCHEMA),
+    ("Courses", None): Conversion(convert_courses, "converted_courses.csv", True, schema=COURSES_SCHEMA),
+    ("Students", None): Conversion(convert_students, "converted_students.csv", True, schema=STUDENTS_SCHEMA),
+    ("Pre-Requisites", None): Conversion(check_prerequisites, "pre_requisites.csv"),
+    ("Two-way Equivalency", "Remove one-way rows"): Conversion(two_way_course_equivalency, "two_way_equivalency.csv",
+                                                               confirmable=True),
+    ("Two-way Equivalency", "Add missing reverse rows"): Conversion(partial(two_way_course_equivalency, add_reverse=True),
+                                                                    "two_way_equivalency.csv", confirmable=True),
+    ("Cleaning Equivalency", None): Conversion(remove_reverse_duplicates, "Two_way_course_equivalency_final.csv", confirmable=True),
+    ("Equivalence Classes", None): Conversion(equivalence_classes, "course_equivalence_classes.csv"),
+
+    ("Cleaning SIS", "Personal Information"): Conversion(personal_information, "sis_personal_information.csv", True),
+    ("Cleaning SIS", "Institute"): Conversion(insti, "sis_institute_information.csv", True,
+                                                              schema=INSTITUTE_SCHEMA),
+    ("Cleaning SIS", "Category Undergrad"): Conversion(category_bachelor, "sis_category_bachelor.csv", True),
+    ("Cleaning SIS", "Category Graduate"): Conversion(category_graduate, "sis_category_graduate.csv", True),
+    ("Cleaning SIS", "Mobile Phone and Mr./Ms."): Conversion(mob_mr_ms, "sis_mobilephone_mrms.csv", True),
+
+    ("SIS", "Check for duplicates"): Conversion(find_duplicate_differences, "converted_duplicate_sis.csv"),
+    ("SIS", "Check for near-duplicates"): Conversion(find_near_duplicates, "converted_near_duplicate_sis.csv"),
+    ("SIS", "Convert only"): Conversion(convert_students, "converted_sis.csv", True, schema=STUDENTS_SCHEMA),
+    ("SIS", "Check Name Fields"): Conversion(check_fields, "converted_checked_fields.csv"),
+    ("SIS", "Select All"): Conversion(_sis_select_all, "converted_sis_all.csv"),
+}
+
+
+def get_conversion(option: str, category: Optional[str] = None) -> Conversion:
+    """Look up a conversion by app option and, for options in CATEGORIES, its sub-category."""
+    if option in CATEGORIES:
+        if category not in CATEGORIES[option]:
+            raise KeyError(f"'{option}' needs one of these categories: {', '.join(CATEGORIES[option])}")
+        return CONVERSIONS[(option, category)]
+    if (option, None) not in CONVERSIONS:
+        raise KeyError(f"Unknown conversion type: '{option}'")
+    return CONVERSIONS[(option, None)]
+
+
+def read_csv(source, schema: Optional[IngestSchema] = None, **kwargs) -> pd.DataFrame:
+    """Read a raw ERP export as utf-8, falling back to latin1.
+
+    ``source`` is a path, the file's bytes or a binary file object.
+
+    The file is parsed by Arrow on all cores (see :mod:`arrow_csv`), or by
+    pandas when Arrow cannot reproduce pandas' result or ``kwargs`` are given.
+    With a ``schema`` only its columns are parsed, and a missing required
+    column raises ``KeyError`` before any conversion starts.
+    """
+    df = None
+    if not kwargs:
+        try:
+            df = arrow_csv.read_csv(
+                _read_bytes(source),
+                usecols=schema.usecols if schema else None,
+                categories=schema.categories if schema else (),
+            )
+        except (arrow_csv.Unsupported, pa.ArrowException, UnicodeDecodeError) as e:
+            log.info("Reading with pandas instead of Arrow: %s", e)
+            if hasattr(source, "seek"):
+                source.seek(0)
+
+    if df is None:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)  # pandas would take raw bytes for a path
+        if schema is not None:
+            kwargs = {**schema.read_options(), **kwargs}
+        try:
+            df = pd.read_csv(source, encoding="utf-8", **kwargs)
+        except UnicodeDecodeError:
+            if hasattr(source, "seek"):
+                source.seek(0)
+            df = pd.read_csv(source, encoding="latin1", **kwargs)
+
+    if schema is not None:
+        schema.check(df)
+        _restore_numbers(df, schema.categories)
+    return df
+
+
+def _restore_numbers(df: pd.DataFrame, categories):
+    """Give category columns holding only numbers the dtype pandas infers for them.
+
+    Converters ``str()`` these values, so an all-numeric Grade must still read
+    ``1.0`` rather than the ``1.00`` written in the file, as it did before the
+    column was read as category.
+    """
+    for col in categories:
+        if col not in df.columns or not isinstance(df[col].dtype, pd.CategoricalDtype):
+            continue
+        labels = pd.Series(df[col].cat.categories, dtype=object)
+        numbers = pd.to_numeric(labels, errors="coerce")
+        if labels.empty or numbers.isna().any():
+            continue
+        codes = df[col].cat.codes.to_numpy()
+        values = numbers.to_numpy()[codes]
+        if (codes < 0).any():  # a missing value makes pandas read the column as float
+            values = values.astype(np.float64)
+            values[codes < 0] = np.nan
+        df[col] = values
+
+
+def _read_bytes(source) -> bytes:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    return source.read()
+
+
+def write_csv(df: pd.DataFrame, destination, header: bool = True):
+    """``df.to_csv(destination, index=False)``, written by Arrow when it can match it.
+
+    ``destination`` is a path or a binary file object.
+    """
+    try:
+        arrow_csv.write_csv(df, destination, header)  # raises before writing anything
+    except arrow_csv.Unsupported as e:
+        log.info("Writing with pandas instead of Arrow: %s", e)
+        if hasattr(destination, "write"):  # gzip/zip members are not recognised as binary
+            destination.write(df.to_csv(index=False, header=header).encode("utf-8"))
+        else:
+            df.to_csv(destination, index=False, header=header)
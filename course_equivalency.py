@@ -1,42 +1,64 @@
+import numpy as np
 import pandas as pd
-import streamlit as st
+import ui
 
-st.cache_data
-def two_way_course_equivalency(df: pd.DataFrame) -> pd.DataFrame:
+
+def pair_codes(df: pd.DataFrame):
+    """Codes of Course A and Course B in one code space, and the course each code stands for."""
+    codes, uniques = pd.factorize(pd.concat([df["Course A"], df["Course B"]], ignore_index=True),
+                                  use_na_sentinel=False)
+    return codes[:len(df)].astype(np.int64), codes[len(df):].astype(np.int64), uniques
+
+
+def missing_reverse(df: pd.DataFrame) -> np.ndarray:
+    """Mask of the rows whose (Course B, Course A) pair appears on no row."""
+    a, b, courses = pair_codes(df)
+    n = len(courses)
+    # Anti-join of every pair's reverse against the pairs themselves
+    return ~pd.Series(b * n + a).isin(a * n + b).to_numpy()
+
+
+def two_way_course_equivalency(df: pd.DataFrame, confirm=None, add_reverse=False) -> pd.DataFrame:
+    """Find rows whose reverse pair is missing and drop them once confirmed.
+
+    With ``add_reverse`` the missing reverse rows are added instead, copying
+    every other column of the one-way row. ``confirm=None`` asks with a
+    Streamlit button; ``True``/``False`` decide up front (used by headless
+    runs, where the button is never clicked).
+    """
     df = df.copy()
 
     # Make sure the required columns exist
     required_cols = ["Course A", "Course B"]
     for col in required_cols:
         if col not in df.columns:
-            st.error(f"Missing required column: {col}")
+            ui.error(f"Missing required column: {col}")
             return df
 
-    # Create a set of all pairs for quick lookup
-    pairs = set(zip(df["Course A"], df["Course B"]))
-
-    # Collect rows that DO NOT have a reverse pair → these are invalid
-    invalid_rows = []
-    for idx, row in df.iterrows():
-        a = row["Course A"]
-        b = row["Course B"]
-
-        if (b, a) not in pairs:  # reverse pair does NOT exist
-            invalid_rows.append(idx)
+    # Rows that DO NOT have a reverse pair → these are invalid
+    invalid = missing_reverse(df)
 
     # If there are invalid rows → show them first for confirmation
-    if invalid_rows:
-        st.warning("⚠️ The following rows DO NOT have matching two-way equivalency:")
-        st.dataframe(df.loc[invalid_rows])
+    if invalid.any():
+        ui.warning("⚠️ The following rows DO NOT have matching two-way equivalency:")
+        ui.dataframe(df[invalid])
 
         # Confirmation button
-        if st.button("❌ Remove non two-way rows"):
-            df = df.drop(index=invalid_rows)
-            st.success("Removed all one-way course equivalencies.")
+        label = "➕ Add missing reverse rows" if add_reverse else "❌ Remove non two-way rows"
+        if confirm or (confirm is None and ui.button(label)):
+            if add_reverse:
+                # One reverse row per missing pair, even when the pair is listed twice
+                one_way = df[invalid].drop_duplicates(subset=required_cols)
+                reverse = one_way.assign(**{"Course A": one_way["Course B"], "Course B": one_way["Course A"]})
+                df = pd.concat([df, reverse], ignore_index=True)
+                ui.success(f"Added {len(reverse)} reverse course equivalencies.")
+            else:
+                df = df[~invalid]
+                ui.success("Removed all one-way course equivalencies.")
         else:
-            st.info("Rows not removed yet. Click the button above if you want to proceed.")
+            ui.info("Rows not changed yet. Click the button above if you want to proceed.")
 
     else:
-        st.success("All course equivalencies are two-way. No issues found.")
+        ui.success("All course equivalencies are two-way. No issues found.")
 
     return df
@@ -0,0 +1,122 @@
+"""Date normalization shared by the SIS converters.
+
+ERP exports mix several date spellings in one column, and birth dates
+repeat heavily. :func:`normalize_dates` parses each distinct value once,
+trying :data:`DATE_FORMATS` in order on all remaining values at a time, and
+remembers the results between calls (e.g. across streamed chunks).
+"""
+import threading
+import warnings
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+import ui
+
+# Tried in this order; a value takes the first format that parses it. Formats
+# agree with pandas' own per-value inference (month before day); two-digit
+# years are left to that inference, whose century pivot differs from strptime.
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%Y/%m/%d",
+    "%m-%d-%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%d-%b-%Y",
+    "%d %b %Y",
+    "%b %d, %Y",
+    "%B %d, %Y",
+    "%Y%m%d",
+]
+INFERRED = "inferred"  # pandas' per-value inference, for values no format matched
+
+# text -> (yyyy-MM-dd or None, format that matched), shared by every session
+# thread; only read or changed while holding _memo_lock
+_memo = {}
+_memo_lock = threading.Lock()
+MEMO_SIZE = 200_000
+
+
+@dataclass
+class DateReport:
+    """How many rows each format parsed, and how many could not be parsed."""
+    matched: Counter = field(default_factory=Counter)
+    failed: int = 0
+    blank: int = 0
+
+    def summary(self, label: str) -> str:
+        parts = [f"{rows:,} × {fmt}" for fmt, rows in self.matched.most_common()]
+        if self.failed:
+            parts.append(f"{self.failed:,} could not be parsed")
+        return f"📅 {label}: " + (", ".join(parts) if parts else "no dates")
+
+    def merge(self, other: "DateReport") -> "DateReport":
+        return DateReport(self.matched + other.matched, self.failed + other.failed, self.blank + other.blank)
+
+    def show(self, label: str):
+        """Report the formats that matched, as a warning if any value failed."""
+        (ui.warning if self.failed else ui.info)(self.summary(label))
+
+
+def _parse_uniques(texts: list) -> dict:
+    """Parse ``texts`` and return ``text -> (yyyy-MM-dd or None, format)``."""
+    results = {}
+    remaining = pd.Series(texts, dtype=object)
+    for fmt in DATE_FORMATS:
+        if remaining.empty:
+            break
+        parsed = pd.to_datetime(remaining, format=fmt, errors="coerce")
+        hit = parsed.notna().to_numpy()
+        for text, iso in zip(remaining[hit], parsed[hit].dt.strftime("%Y-%m-%d")):
+            results[text] = (iso, fmt)
+        remaining = remaining[~hit]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # "could not infer format" for each value
+        for text in remaining:
+            parsed = pd.to_datetime(text, errors="coerce")
+            results[text] = (None, None) if pd.isna(parsed) else (parsed.strftime("%Y-%m-%d"), INFERRED)
+    return results
+
+
+def normalize_dates(values: pd.Series, missing=""):
+    """Format every date in ``values`` as ``yyyy-MM-dd``.
+
+    Blank and unparseable values become ``missing``. Returns the formatted
+    column and a :class:`DateReport`.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    counts = np.bincount(codes, minlength=len(uniques))
+    texts = [None if pd.isna(u) or str(u).strip() == "" else str(u) for u in uniques]
+
+    # This call's own results, so evicting the memo cannot lose any of them
+    distinct = {t for t in texts if t is not None}
+    with _memo_lock:
+        results = {t: _memo[t] for t in distinct if t in _memo}
+    parsed = _parse_uniques([t for t in distinct if t not in results])
+    results.update(parsed)
+    with _memo_lock:
+        if len(_memo) + len(parsed) > MEMO_SIZE:
+            _memo.clear()
+        _memo.update(parsed)
+
+    report = DateReport()
+    formatted = np.empty(len(uniques), dtype=object)
+    for i, text in enumerate(texts):
+        if text is None:
+            formatted[i] = missing
+            report.blank += int(counts[i])
+            continue
+        iso, fmt = results[text]
+        if iso is None:
+            formatted[i] = missing
+            report.failed += int(counts[i])
+        else:
+            formatted[i] = iso
+            report.matched[fmt] += int(counts[i])
+
+    return pd.Series(formatted[codes], index=values.index, name=values.name), report
@@ -0,0 +1,104 @@
+"""Courses that are transitively equivalent through Course A / Course B pairs.
+
+The equivalency files list directed pairs; the registrar's question is which
+courses end up equivalent to a given one through any chain of pairs. An
+:class:`EquivalenceIndex` answers it with a union-find over the factorized
+course codes, kept in one parent array. All pairs are united together: roots
+are hooked under the smaller root of each pair and the array is flattened by
+pointer jumping, repeated until no pair joins two classes. Afterwards every
+course points straight at its class, so :meth:`EquivalenceIndex.same_class`
+is two array lookups.
+"""
+import numpy as np
+import pandas as pd
+
+import ui
+from course_equivalency import pair_codes
+
+# A class with more courses than this usually means a wrong pair chained two
+# unrelated groups together
+MAX_CLASS_SIZE = 10
+
+
+def _flatten(parent: np.ndarray) -> np.ndarray:
+    """Point every entry of ``parent`` straight at its root."""
+    while True:
+        grandparent = parent[parent]
+        if (grandparent == parent).all():
+            return parent
+        parent = grandparent
+
+
+class EquivalenceIndex:
+    """Equivalence classes of the courses in a Course A / Course B frame."""
+
+    def __init__(self, df: pd.DataFrame):
+        # A blank course would join every class it is paired with
+        df = df[["Course A", "Course B"]].apply(lambda col: col.astype("string").str.strip())
+        df = df[(df["Course A"].fillna("") != "") & (df["Course B"].fillna("") != "")]
+        a, b, self.courses = pair_codes(df)
+        self._position = pd.Index(self.courses)
+
+        parent = np.arange(len(self.courses))
+        while True:
+            root_a, root_b = parent[a], parent[b]
+            joins = root_a != root_b
+            if not joins.any():
+                break
+            np.minimum.at(parent, np.maximum(root_a, root_b)[joins], np.minimum(root_a, root_b)[joins])
+            parent = _flatten(parent)
+
+        # Number the classes 0..k-1 in order of their first course
+        self.labels, _ = pd.factorize(parent)
+        self.sizes = np.bincount(self.labels)
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def find(self, course) -> int:
+        """Class number of ``course``; ``KeyError`` if it appears in no pair."""
+        return int(self.labels[self._position.get_loc(course)])
+
+    def same_class(self, course_a, course_b) -> bool:
+        """Whether the two courses are equivalent through some chain of pairs."""
+        if course_a not in self._position or course_b not in self._position:
+            return course_a == course_b
+        return self.find(course_a) == self.find(course_b)
+
+    def members(self, course) -> list:
+        """Every course equivalent to ``course``, itself included."""
+        return list(self.courses[self.labels == self.find(course)])
+
+    def components(self) -> pd.DataFrame:
+        """One row per course with its class number and the size of that class."""
+        order = np.lexsort((np.asarray(self.courses, dtype=str), self.labels))
+        return pd.DataFrame({
+            "Class": self.labels[order],
+            "Course": np.asarray(self.courses)[order],
+            "Class Size": self.sizes[self.labels[order]],
+        })
+
+    def oversized(self, max_size: int = MAX_CLASS_SIZE) -> pd.DataFrame:
+        """The rows of :meth:`components` in classes of more than ``max_size`` courses."""
+        components = self.components()
+        return components[components["Class Size"] > max_size].reset_index(drop=True)
+
+
+def equivalence_classes(df: pd.DataFrame) -> pd.DataFrame:
+    """Export every equivalence class, warning about classes that look too large."""
+    required_cols = ["Course A", "Course B"]
+    for col in required_cols:
+        if col not in df.columns:
+            ui.error(f"Missing required column: {col}")
+            return pd.DataFrame()
+
+    index = EquivalenceIndex(df)
+    components = index.components()
+    oversized = index.oversized()
+
+    if not oversized.empty:
+        ui.warning(f"⚠️ {oversized['Class'].nunique()} classes have more than {MAX_CLASS_SIZE} courses. "
+                   "Check them for a pair that links unrelated courses:")
+        ui.dataframe(oversized)
+    ui.success(f"✅ {len(components)} courses in {len(index)} equivalence classes.")
+    return components
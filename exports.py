@@ -0,0 +1,90 @@
+"""Download formats for converted frames.
+
+Exports are rendered chunk by chunk, so :func:`write_export` to a file (the
+CLI) never holds a second full copy of the frame as one big string. The app's
+downloads go through :func:`export`, whose bytes Streamlit keeps in memory
+until they are served, so there the whole encoded export is resident once.
+"""
+import gzip
+import io
+import os
+import zipfile
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import parquet
+
+from conversions import write_csv
+
+CHUNK_ROWS = 100_000
+
+# Label → (file extension added to the CSV name, MIME type)
+FORMATS = {
+    "CSV": ("", "text/csv"),
+    "CSV (gzip)": (".gz", "application/gzip"),
+    "CSV (zip)": (".zip", "application/zip"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+
+def export_name(file_name: str, fmt: str) -> str:
+    """``converted_grades.csv`` → the name of its download in format ``fmt``."""
+    extension = FORMATS[fmt][0]
+    if extension in (".zip", ".parquet"):
+        return os.path.splitext(file_name)[0] + extension
+    return file_name + extension
+
+
+def _chunks(df: pd.DataFrame):
+    for start in range(0, max(len(df), 1), CHUNK_ROWS):
+        yield start, df.iloc[start:start + CHUNK_ROWS]
+
+
+def _write_csv_chunks(df, f):
+    for start, chunk in _chunks(df):
+        write_csv(chunk, f, header=start == 0)
+
+
+def _arrow_column(values: pd.Series) -> pa.Array:
+    try:
+        return pa.array(values, from_pandas=True)
+    except (pa.ArrowException, TypeError):  # mixed object column: store its text
+        return pa.array(values.map(lambda v: v if pd.isna(v) else str(v)), type=pa.string(), from_pandas=True)
+
+
+def _write_parquet(df, f):
+    table = pa.table({str(col): _arrow_column(df[col]) for col in df.columns})
+    parquet.write_table(table, f, row_group_size=CHUNK_ROWS)
+
+
+def write_export(df: pd.DataFrame, fmt: str, file_name: str, f):
+    """Write ``df`` as ``fmt`` to the binary file ``f``.
+
+    ``file_name`` is the CSV name the conversion uses; it names the member
+    of a zip download.
+    """
+    if fmt == "CSV":
+        _write_csv_chunks(df, f)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=f, mode="wb", mtime=0) as gz:
+            _write_csv_chunks(df, gz)
+    elif fmt == "CSV (zip)":
+        with zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED) as zf:
+            with zf.open(file_name, "w", force_zip64=True) as member:
+                _write_csv_chunks(df, member)
+    elif fmt == "Parquet":
+        _write_parquet(df, f)
+    else:
+        raise KeyError(f"Unknown export format: '{fmt}'")
+
+
+def export(df: pd.DataFrame, fmt: str, file_name: str) -> io.BytesIO:
+    """Render ``df`` as ``fmt`` into a ``BytesIO`` for ``st.download_button``.
+
+    Streamlit reads the whole download into memory anyway, and only accepts
+    bytes-like objects and real files from a deferred ``data`` callable.
+    """
+    f = io.BytesIO()
+    write_export(df, fmt, file_name, f)
+    f.seek(0)
+    return f
@@ -0,0 +1,358 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+
+import ui
+
+SCHOOL_COLUMN = "School (Indicate the name of the school where the course was credited. This field is optional for credited grades.)"
+
+
+@dataclass(frozen=True)
+class GradingProfile:
+    """Grade scale and per-export rules that drive :func:`convert_grade_records`.
+
+    The remarks lookup table is compiled once when the profile is created, so
+    the module-level profiles below are ready to use as soon as this module
+    is imported.
+    """
+    name: str
+    pass_grades: tuple
+    fail_grades: tuple
+    no_credit_grades: tuple = ("AW", "IP")
+    # Graduate exports carry the crediting school in a "School Name"-like column
+    school_from_name_column: bool = False
+    # Graduate exports mark every passed grade as credited
+    credited_from_remarks: bool = False
+    remarks: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Later updates win, matching the Pass → Fail → No Credit precedence
+        table = {g.upper(): "No Credit" for g in self.no_credit_grades}
+        table.update({g.upper(): "Fail" for g in self.fail_grades})
+        table.update({g.upper(): "Pass" for g in self.pass_grades})
+        object.__setattr__(self, "remarks", table)
+
+
+# ---------------------------- PROFILES ----------------------------
+UNDERGRADUATE = GradingProfile(
+    name="Grades",
+    pass_grades=(
+        "1", "1.00", "1.25", "1.50", "1.75", "2.00", "2.25", "2.50", "2.75", "3.00",
+        "PASS", "A", "B+", "B", "C+", "C", "D+", "D", "P",
+    ),
+    fail_grades=("5.00", "FAIL", "F"),
+)
+
+GRADUATE = GradingProfile(
+    name="Graduate Grades",
+    pass_grades=(
+        "1", "1.00", "1.25", "1.50", "1.5", "1.75", "2.00", "2", "2.25", "2.50", "2.5", "2.75", "3.00", "3",
+        "PASS", "A", "A-", "B+", "B", "C+", "C", "D+", "D", "P",
+    ),
+    fail_grades=("5.00", "5", "FAIL", "F"),
+    school_from_name_column=True,
+    credited_from_remarks=True,
+)
+
+
+# Edusuite grade layout, in order
+OUTPUT_COLUMNS = [
+    "Student Number",
+    "Course Code",
+    "Elective Code",
+    "In Lieu Of (Original Course Code)",
+    "In Lieu Of Parent Elective (Parent code of the original Course code)",
+    "Credited",
+    "Dropped (YES/NO)",
+    "Grade",
+    "School Semester (Format should by YYYY-YYYY-[SEMESTER NUMBER])",
+    SCHOOL_COLUMN,
+    "Remarks",
+    "Grade Point",
+    "Program Code",
+    "Program Revision ID",
+    "Grading System",
+    "Year Level",
+    "Credited Course Code",
+    "Credited Course Name",
+    "Credited Course Units",
+    "Credited Grade",
+    "Overwrite existing record (YES/NO)",
+    "Current Program",
+    "Is the 2 programs match?",
+]
+
+
+@dataclass(frozen=True)
+class SchoolColumnReport:
+    """Which upload column fills the School column; ``None`` when none looks like one."""
+    column: str = None
+
+    def merge(self, other: "SchoolColumnReport") -> "SchoolColumnReport":
+        return self  # every chunk of a file has the same columns
+
+    def show(self):
+        if self.column is not None:
+            ui.success(f"📌 Using column '{self.column}' as School Name")
+        else:
+            ui.warning("⚠️ No column resembling 'School Name' was found in the uploaded CSV.")
+
+
+def _factorize_text(values):
+    """Factorize a column and return its codes plus ``str()`` of every unique value.
+
+    Grade exports repeat the same handful of grades, terms and programs on
+    millions of rows, so every string rule below runs on the uniques only and
+    is broadcast back through the integer codes.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return codes, pd.Series([str(u) for u in uniques], dtype=object)
+
+
+def _broadcast(unique_values, codes) -> np.ndarray:
+    return np.asarray(unique_values, dtype=object)[codes]
+
+
+def _split_program(text: pd.Series):
+    """Split ``"BSIT (2018)"`` style values into program code and revision."""
+    program = text.str.replace(r"\(\s*\d{4}\s*\)", "", regex=True).str.strip()
+    revision = text.str.extract(r"\((\d{4})\)", expand=False).fillna("")
+    return program, revision
+
+
+def convert_grade_records(df: pd.DataFrame, profile: GradingProfile, validate: bool = True) -> pd.DataFrame:
+    """Convert an ERP grade export to the Edusuite grade layout using ``profile``.
+
+    Pass ``validate=False`` to skip validation, e.g. when the caller builds
+    the :class:`ValidationReport` itself or aggregates it over chunks.
+    """
+    # ---------------------------- DROPPED ----------------------------
+    grade_codes, grade_text = _factorize_text(df["Grade"])
+    grade_key = grade_text.str.strip().str.upper()
+    dropped = np.where(grade_key == "AW", "YES", "NO")
+
+    # ---------------------------- SCHOOL SEMESTER → YYYY-YYYY-SEM ----------------------------
+    year_codes, year_text = _factorize_text(df["Academic Year"])
+    term_codes, term_text = _factorize_text(df["Academic Term"])
+
+    years = year_text.str.replace(r"[^0-9\-]", "", regex=True).str.strip()
+    term = term_text.str.strip().str.lower()
+    term_num = np.select(
+        [term.str.contains("first", regex=False), term.str.contains("second", regex=False)],
+        ["1", "2"],
+        default="3",
+    )
+
+    # Build each distinct (year, term) label once
+    n_terms = max(len(term_text), 1)
+    pair_codes, pairs = pd.factorize(year_codes * n_terms + term_codes)
+    pairs = np.asarray(pairs)
+    semesters = _broadcast(years, pairs // n_terms) + "-" + _broadcast(term_num, pairs % n_terms)
+
+    # ---------------------------- REMARKS ----------------------------
+    remarks = grade_key.map(profile.remarks).fillna("No Credit")
+
+    # ---------------------------- PROGRAM + REVISION ----------------------------
+    program_codes, program_text = _factorize_text(df["Program"])
+    program, revision = _split_program(program_text)
+
+    # ---------------------------- CURRENT PROGRAM MATCH FIX ----------------------------
+    if "Current Program" in df.columns:
+        current = df["Current Program"].fillna("")
+    else:
+        current = pd.Series("", index=df.index, dtype=object)
+
+    current_codes, current_text = _factorize_text(current)
+    current_program, current_revision = _split_program(current_text)
+
+    name_match = (
+        _broadcast(program.str.upper(), program_codes)
+        == _broadcast(current_program.str.strip().str.upper(), current_codes)
+    )
+    rev_match = (
+        _broadcast(revision.str.strip(), program_codes)
+        == _broadcast(current_revision.str.strip(), current_codes)
+    )
+
+    computed = {
+        "Dropped (YES/NO)": _broadcast(dropped, grade_codes),
+        "School Semester (Format should by YYYY-YYYY-[SEMESTER NUMBER])": semesters[pair_codes],
+        "Remarks": _broadcast(remarks, grade_codes),
+        "Program Code": _broadcast(program, program_codes),
+        "Program Revision ID": _broadcast(revision, program_codes),
+        "Current Program": current,
+        "Is the 2 programs match?": np.where(name_match & rev_match, "YES", "NO").astype(object),
+        # ---------------------------- DEFAULTS ----------------------------
+        "Overwrite existing record (YES/NO)": df.get("Overwrite existing record (YES/NO)", "").replace("", "NO"),
+    }
+
+    # ---------------------------- CREDITED ----------------------------
+    if profile.credited_from_remarks:
+        computed["Credited"] = _broadcast(np.where(remarks == "Pass", "YES", "NO"), grade_codes)
+    else:
+        computed["Credited"] = df.get("Credited", "").replace("", "NO")
+
+    # ---------------------------- SCHOOL NAME ----------------------------
+    if profile.school_from_name_column:
+        # Fuzzy lookup for 'School Name'
+        possible_school_cols = [c for c in df.columns if "school" in c.lower() and "name" in c.lower()]
+
+        if possible_school_cols:
+            school_col = possible_school_cols[0]   # Pick first matched column
+            computed[SCHOOL_COLUMN] = df[school_col]
+            ui.show_report(SchoolColumnReport(school_col))
+        else:
+            computed[SCHOOL_COLUMN] = ""
+            ui.show_report(SchoolColumnReport())
+
+    final_df = pd.DataFrame(
+        {
+            col: computed[col] if col in computed else df[col] if col in df.columns else ""
+            for col in OUTPUT_COLUMNS
+        },
+        index=df.index,
+    )
+
+    if validate:
+        validate_converted_data(final_df)
+    return final_df
+
+
+SEMESTER_PATTERN = r"^\d{4}-\d{4}-[1-3]$"
+REVISION_PATTERN = r"^(\d{4})?$"
+VALID_REMARKS = {"Pass", "Fail", "No Credit"}
+YES_NO_COLUMNS = ["Dropped (YES/NO)", "Credited", "Overwrite existing record (YES/NO)"]
+
+# rule -> (column checked, test applied to the column's unique values)
+VALIDATION_RULES = {
+    "School Semester": (
+        "School Semester (Format should by YYYY-YYYY-[SEMESTER NUMBER])",
+        lambda s: s.str.match(SEMESTER_PATTERN),
+    ),
+    "Remarks": ("Remarks", lambda s: s.isin(VALID_REMARKS)),
+    "Program Code": ("Program Code", lambda s: s.str.strip() != ""),
+    "Program Revision ID": ("Program Revision ID", lambda s: s.str.match(REVISION_PATTERN)),
+    **{col: (col, lambda s: s.isin({"YES", "NO"})) for col in YES_NO_COLUMNS},
+}
+
+
+@dataclass
+class ValidationReport:
+    """Row-level result of validating a converted grade frame.
+
+    ``masks`` maps each rule of :data:`VALIDATION_RULES` to a boolean array
+    that is True for the rows failing it.
+    """
+    frame: pd.DataFrame = field(repr=False)
+    masks: dict = field(repr=False)
+
+    @property
+    def counts(self) -> dict:
+        return {rule: int(mask.sum()) for rule, mask in self.masks.items()}
+
+    @property
+    def failed(self) -> np.ndarray:
+        """Rows failing at least one rule."""
+        failed = np.zeros(len(self.frame), dtype=bool)
+        for mask in self.masks.values():
+            failed |= mask
+        return failed
+
+    def rows(self, rule: str) -> pd.Index:
+        """Index labels of the rows failing ``rule``."""
+        return self.frame.index[self.masks[rule]]
+
+    def errors(self) -> pd.DataFrame:
+        """One line per failing (row, rule) with the offending value, in row order."""
+        parts = []
+        for rule, mask in self.masks.items():
+            positions = np.flatnonzero(mask)
+            if len(positions):
+                col = VALIDATION_RULES[rule][0]
+                parts.append(pd.DataFrame({
+                    "Position": positions,
+                    "Row": self.frame.index[positions],
+                    "Rule": rule,
+                    "Column": col,
+                    "Value": self.frame[col].to_numpy()[positions],
+                }))
+        if not parts:
+            return pd.DataFrame(columns=["Row", "Rule", "Column", "Value"])
+        errors = pd.concat(parts, ignore_index=True).sort_values("Position", kind="stable")
+        return errors.drop(columns="Position").reset_index(drop=True)
+
+    def to_csv(self, path_or_buf, **kwargs):
+        """Export :meth:`errors`, e.g. as ``errors.csv`` next to the converted file."""
+        return self.errors().to_csv(path_or_buf, index=False, **kwargs)
+
+    def show(self):
+        """Render the summary in Streamlit (or the log when headless)."""
+        return show_validation(self.counts)
+
+
+def build_validation_report(df: pd.DataFrame) -> ValidationReport:
+    """Evaluate every validation rule in one pass over the converted frame.
+
+    Each column is factorized once and its rule tested on the unique values;
+    the per-row failure masks are broadcast back through the codes.
+    """
+    masks = {}
+    for rule, (col, is_valid) in VALIDATION_RULES.items():
+        codes, uniques = pd.factorize(df[col], use_na_sentinel=False)
+        invalid = ~np.asarray(is_valid(pd.Series(uniques, dtype=object)), dtype=bool)
+        masks[rule] = invalid[codes]
+    return ValidationReport(df, masks)
+
+
+def validate_converted_data(df: pd.DataFrame, show: bool = True) -> ValidationReport:
+    report = build_validation_report(df)
+    if show:
+        report.show()
+    return report
+
+
+def show_validation(counts: dict):
+    """Render per-rule failure counts; they may be summed over streamed chunks."""
+    errors = []
+
+    # 1. Validate School Semester Format: YYYY-YYYY-#
+    if counts["School Semester"]:
+        errors.append(f"❌ Invalid School Semester format in {counts['School Semester']} rows.")
+
+    else:
+        ui.success("✅ School Semester is correct!")
+
+    # 2. Remarks check
+    if counts["Remarks"]:
+        errors.append("❌ Remarks column contains unexpected values.")
+
+    else:
+        ui.success("✅ Remarks are good")
+
+    # 3. Program Code should not be empty
+    if counts["Program Code"]:
+        errors.append("❌ Some Program Code values are empty.")
+
+    else:
+        ui.success("✅ Programs are validated")
+
+    # 4. Program Revision ID must be 4 digits or empty
+    if counts["Program Revision ID"]:
+        errors.append(f"❌ Invalid Program Revision ID format in {counts['Program Revision ID']} rows.")
+    
+    else:
+        ui.success("✅ Revisions are equal")
+
+    # 5. YES/NO Fields Validation
+    for col in YES_NO_COLUMNS:
+        if counts[col]:
+            errors.append(f"❌ Column '{col}' contains values besides YES/NO.")
+
+    # Summary Output
+    if errors:
+        ui.error("⚠️ DATA VALIDATION FAILED:\n" + "\n".join(errors))
+    else:
+        ui.success("✅ All validations passed. Data conversion looks correct!")
+
+    return errors
+
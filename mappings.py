@@ -0,0 +1,190 @@
+"""Department and institute lookup tables, compiled from ``mappings.json``.
+
+Each table maps a target value (an institute or department code) to the raw
+ERP spellings that mean it. Adding a department is an edit to the JSON file.
+On first use a table is compiled into one dictionary from the *normalized*
+spelling to its target, and columns are mapped one unique value at a time.
+
+Values that match no spelling fall back to the table's default (``UNKNOWN``);
+:meth:`Mapping.suggest` lists them with the closest known spellings so they
+can be added to the file.
+"""
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+
+import numpy as np
+import pandas as pd
+
+import ui
+
+MAPPINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mappings.json")
+
+
+def _upper(text: pd.Series) -> pd.Series:
+    return text.str.strip().str.upper()
+
+
+def _upper_nbsp(text: pd.Series) -> pd.Series:
+    return _upper(text).str.replace("\xa0", " ", regex=False)
+
+
+def _department_path(text: pd.Series) -> pd.Series:
+    """``"Academic:Inst.  of X"`` → ``"ACADEMIC : INST. OF X"``."""
+    text = text.str.upper()
+    text = text.str.replace(r"\s+", " ", regex=True)  # collapse multiple spaces
+    text = text.str.replace(r"\s*:\s*", " : ", regex=True)  # normalize colons
+    return text.str.strip()
+
+
+# Normalizers a table can name in mappings.json; they run on object-dtype text
+NORMALIZERS = {
+    "upper": _upper,
+    "upper_nbsp": _upper_nbsp,
+    "department_path": _department_path,
+}
+
+
+def _ngrams(text: str, n: int = 3) -> set:
+    """Character n-grams of ``text``, padded so word starts and ends count too."""
+    text = f" {text} "
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class FuzzyIndex:
+    """Inverted index from character trigrams to the known spellings containing them.
+
+    A query only touches the posting lists of its own trigrams, and scores
+    every spelling at once by Dice similarity of the trigram sets.
+    """
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.sizes = np.zeros(len(self.keys))
+        postings = defaultdict(list)
+        for i, key in enumerate(self.keys):
+            grams = _ngrams(key)
+            self.sizes[i] = len(grams)
+            for gram in grams:
+                postings[gram].append(i)
+        self.postings = {gram: np.array(ids, dtype=np.intp) for gram, ids in postings.items()}
+
+    def search(self, text: str, limit: int = 3, min_score: float = 0.3) -> list:
+        """Best ``(spelling, score)`` matches for ``text``, score in 0..1, best first."""
+        grams = _ngrams(text)
+        hits = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not hits:
+            return []
+        overlap = np.bincount(np.concatenate(hits), minlength=len(self.keys))
+        scores = 2 * overlap / (len(grams) + self.sizes)
+        best = np.argsort(-scores, kind="stable")[:limit]
+        return [(self.keys[i], round(float(scores[i]), 3)) for i in best if scores[i] >= min_score]
+
+
+@dataclass(frozen=True)
+class Mapping:
+    name: str
+    normalize: str
+    default: str
+    table: dict  # normalized spelling -> target
+
+    def normalized(self, values) -> pd.Series:
+        """``str()`` of ``values`` passed through this table's normalizer."""
+        return NORMALIZERS[self.normalize](pd.Series([str(v) for v in values], dtype=object))
+
+    def lookup(self, value) -> str:
+        return self.table.get(self.normalized([value]).iloc[0], self.default)
+
+    def map(self, column: pd.Series) -> pd.Series:
+        """Map every value of ``column``, normalizing and looking up each unique value once."""
+        codes, uniques = pd.factorize(column, use_na_sentinel=False)
+        targets = self.normalized(uniques).map(self.table).fillna(self.default)
+        return pd.Series(np.asarray(targets, dtype=object)[codes], index=column.index, name=column.name)
+
+    @cached_property
+    def index(self) -> FuzzyIndex:
+        return FuzzyIndex(self.table)
+
+    def suggest(self, column: pd.Series, limit: int = 3) -> pd.DataFrame:
+        """Values of ``column`` that match no spelling, with the closest known ones.
+
+        One row per (unmatched value, candidate), most frequent values first.
+        A value with no candidate at all gets a single row with a blank suggestion.
+        """
+        codes, uniques = pd.factorize(column, use_na_sentinel=False)
+        counts = np.bincount(codes, minlength=len(uniques))
+        normalized = self.normalized(uniques)
+        unmatched = np.flatnonzero(~normalized.isin(self.table.keys()).to_numpy())
+
+        rows = []
+        for i in sorted(unmatched, key=lambda i: -counts[i]):
+            candidates = self.index.search(normalized.iloc[i], limit) or [("", 0.0)]
+            for spelling, score in candidates:
+                rows.append({
+                    "Value": str(uniques[i]),
+                    "Rows": int(counts[i]),
+                    "Closest Spelling": spelling,
+                    "Maps To": self.table.get(spelling, ""),
+                    "Score": score,
+                })
+        return pd.DataFrame(rows, columns=["Value", "Rows", "Closest Spelling", "Maps To", "Score"])
+
+    def warn_unmatched(self, column: pd.Series, label: str) -> pd.DataFrame:
+        """Show the unmatched values of ``column`` with suggestions; return them too.
+
+        In a streamed conversion the warning is shown once for the whole file
+        (see :func:`ui.merged_reports`).
+        """
+        suggestions = self.suggest(column)
+        ui.show_report(UnmatchedReport(self.name, self.default, suggestions), label)
+        return suggestions
+
+
+@dataclass(frozen=True)
+class UnmatchedReport:
+    """The :meth:`Mapping.suggest` frame of a column, ready to show."""
+    name: str
+    default: str
+    suggestions: pd.DataFrame
+
+    def merge(self, other: "UnmatchedReport") -> "UnmatchedReport":
+        """Suggestions of both reports, with each value's rows added up."""
+        frames = [self.suggestions, other.suggestions]
+        rows = (pd.concat([frame.drop_duplicates("Value") for frame in frames])
+                .groupby("Value", sort=False)["Rows"].sum())
+        merged = pd.concat(frames, ignore_index=True).drop_duplicates(["Value", "Closest Spelling"])
+        merged["Rows"] = merged["Value"].map(rows).astype(int)
+        merged = merged.sort_values("Rows", ascending=False, kind="stable", ignore_index=True)
+        return UnmatchedReport(self.name, self.default, merged)
+
+    def show(self, label: str):
+        suggestions = self.suggestions
+        if suggestions.empty:
+            return
+        n_values = suggestions["Value"].nunique()
+        n_rows = suggestions.drop_duplicates("Value")["Rows"].sum()
+        ui.warning(f"⚠️ {n_values} {label} value(s) on {n_rows} row(s) matched no mapping "
+                   f"and became '{self.default}'. Closest known spellings "
+                   f"(add them to mappings.json → {self.name}):")
+        ui.dataframe(suggestions)
+
+
+@lru_cache(maxsize=None)
+def get_mapping(name: str, path: str = MAPPINGS_FILE) -> Mapping:
+    """Compile the table ``name`` of the mappings file (once per process)."""
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)[name]
+
+    targets, variants = [], []
+    for target, spellings in spec["values"].items():
+        targets += [target] * len(spellings)
+        variants += spellings
+
+    table = {}
+    normalized = NORMALIZERS[spec["normalize"]](pd.Series(variants, dtype=object))
+    for key, target in zip(normalized, targets):
+        table.setdefault(key, target)  # the first listed target wins, as it always has
+
+    return Mapping(name, spec["normalize"], spec["default"], table)
@@ -1,44 +1,50 @@
+import numpy as np
 import pandas as pd
-import re
-import streamlit as st
+import ui
 
 def check_prerequisites(df: pd.DataFrame):
+    year_col = "Academic Year (1, 2, 3...)"
+    term_col = "Term (1, 2, 3...)"
+    course_col = "Course Code (Or child elective code)"
+
     # Ensure correct data types
-    df["Academic Year (1, 2, 3...)"] = df["Academic Year (1, 2, 3...)"].astype(int)
-    df["Term (1, 2, 3...)"] = df["Term (1, 2, 3...)"].astype(int)
-    df["Prerequisite"] = ""  # start empty
-
-    def normalize_code(code):
-        return re.sub(r'[^A-Za-z0-9]', '', str(code)).upper()
-
-    def process_group(sub_df):
-        # Sort by academic year and term (chronological order)
-        sub_df = sub_df.sort_values(by=["Academic Year (1, 2, 3...)", "Term (1, 2, 3...)"]).reset_index(drop=True)
-
-        for idx, row in sub_df.iterrows():
-            year = row["Academic Year (1, 2, 3...)"]
-            term = row["Term (1, 2, 3...)"]
-
-            # Find all previous courses in this revision
-            prior_courses = sub_df[
-                (sub_df["Academic Year (1, 2, 3...)"] < year)
-                | (
-                    (sub_df["Academic Year (1, 2, 3...)"] == year)
-                    & (sub_df["Term (1, 2, 3...)"] < term)
-                )
-            ].copy()
-
-            # Pick the last (most recent) one
-            if not prior_courses.empty:
-                last_course = prior_courses.iloc[-1]["Course Code (Or child elective code)"]
-                sub_df.at[idx, "Prerequisite"] = last_course
-
-        return sub_df
-
-    # Group by Program Code + Revision ID
-    df = df.groupby(["Program Code", "Revision ID"], group_keys=False).apply(process_group)
-
-    st.success("✅ Immediate prerequisites populated based on Academic Year and Term (per Revision ID).")
-    st.dataframe(df[["Program Code", "Revision ID", "Course Code (Or child elective code)", "Prerequisite"]])
+    df = df.copy()
+    df[year_col] = df[year_col].astype(int)
+    df[term_col] = df[term_col].astype(int)
+
+    # Number each (Program Code, Revision ID) curriculum in sorted key order;
+    # rows with a missing key get -1 and are left out, like a groupby would
+    df["_group"] = df.groupby(["Program Code", "Revision ID"], sort=True).ngroup()
+    df = df[df["_group"] >= 0]
+
+    # Sort the whole catalogue at once: curriculum first, then chronological order.
+    # The stable sort keeps the upload order of courses within the same term.
+    df = df.sort_values(by=["_group", year_col, term_col], kind="stable").reset_index(drop=True)
+
+    group = df["_group"].to_numpy()
+    year = df[year_col].to_numpy()
+    term = df[term_col].to_numpy()
+
+    # A (year, term) bucket starts wherever the curriculum, year or term changes
+    new_group = np.ones(len(df), dtype=bool)
+    new_group[1:] = group[1:] != group[:-1]
+    new_bucket = new_group.copy()
+    new_bucket[1:] |= (year[1:] != year[:-1]) | (term[1:] != term[:-1])
+
+    # The immediate prerequisite is the last course of the previous bucket
+    # (the row just before this bucket starts), unless that row belongs to
+    # another curriculum
+    bucket_start = np.flatnonzero(new_bucket)[np.cumsum(new_bucket) - 1]
+    has_prior = (bucket_start > 0) & ~new_group[bucket_start]
+
+    courses = df[course_col].to_numpy(dtype=object)
+    prerequisite = np.full(len(df), "", dtype=object)
+    prerequisite[has_prior] = courses[bucket_start[has_prior] - 1]
+
+    df = df.drop(columns="_group")
+    df["Prerequisite"] = prerequisite
+
+    ui.success("✅ Immediate prerequisites populated based on Academic Year and Term (per Revision ID).")
+    ui.dataframe(df[["Program Code", "Revision ID", "Course Code (Or child elective code)", "Prerequisite"]])
 
     return df
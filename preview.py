@@ -0,0 +1,71 @@
+"""Paginated preview of a converted frame in the Streamlit app.
+
+Only the rows of the visible page are sent to the browser, so previewing a
+million-row result costs as much as previewing a hundred rows.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+MODES = ["Head", "Tail", "Random sample"]
+PAGE_SIZES = [25, 100, 500, 1000]
+ALL_ROWS = "All rows"
+ANY_FAILURE = "Rows failing any rule"
+
+
+def _row_filter(report, key) -> np.ndarray:
+    """Positions of the rows to page through, after the validation-failure filter."""
+    options = [ALL_ROWS]
+    if report is not None and report.failed.any():
+        options += [ANY_FAILURE] + [rule for rule, count in report.counts.items() if count]
+
+    choice = st.selectbox("Show", options, key=f"{key}:filter") if len(options) > 1 else ALL_ROWS
+    if choice == ALL_ROWS:
+        return None
+    if choice == ANY_FAILURE:
+        return np.flatnonzero(report.failed)
+    return np.flatnonzero(report.masks[choice])
+
+
+def page_positions(n_rows: int, mode: str, page: int, page_size: int) -> np.ndarray:
+    """Positions (into ``range(n_rows)``) shown on 1-based ``page`` in ``mode``.
+
+    Tail pages count back from the end; a random page draws ``page_size``
+    rows without replacement, seeded by the page number so it is stable
+    across reruns.
+    """
+    if mode == "Head":
+        return np.arange((page - 1) * page_size, min(page * page_size, n_rows))
+    if mode == "Tail":
+        return np.arange(max(n_rows - page * page_size, 0), n_rows - (page - 1) * page_size)
+    rng = np.random.default_rng(page)
+    return np.sort(rng.choice(n_rows, size=min(page_size, n_rows), replace=False))
+
+
+def paginated_preview(df: pd.DataFrame, report=None, key: str = "preview"):
+    """Show one page of ``df`` with head/tail/random-sample modes.
+
+    With a :class:`grading.ValidationReport`, the rows can be narrowed to
+    those failing any rule or one particular rule.
+    """
+    columns = st.columns(4)
+    with columns[0]:
+        rows = _row_filter(report, key)
+    n_rows = len(df) if rows is None else len(rows)
+
+    mode = columns[1].selectbox("Rows", MODES, key=f"{key}:mode")
+    page_size = columns[2].selectbox("Page size", PAGE_SIZES, index=1, key=f"{key}:size")
+    n_pages = max(-(-n_rows // page_size), 1)
+    # Keyed by the row count too, so a narrower filter starts again at page 1
+    page = columns[3].number_input("Page", min_value=1, max_value=n_pages, value=1,
+                                   key=f"{key}:page:{n_rows}:{page_size}")
+
+    positions = page_positions(n_rows, mode, int(page), page_size)
+    if rows is not None:
+        positions = rows[positions]
+
+    st.dataframe(df.iloc[positions])
+    if len(positions):
+        st.caption(f"{len(positions):,} of {n_rows:,} rows · page {int(page):,} of {n_pages:,}")
+    else:
+        st.caption("No rows to show.")
@@ -1,8 +1,74 @@
+import numpy as np
 import pandas as pd
 import re
-import streamlit as st
+import ui
+from mappings import get_mapping
+
+# ERP column → Edusuite column, in output order
+COLUMN_MAPPING = {
+    "Program Code": "Program Code",
+    "Description": "Description",
+    "Institute Code": "Institute Code",
+    "Revision ID": "Revision ID",
+    "Academic Year": "Academic Year(1,2,3...)",
+    "Term": "Term(1,2,3...)",
+    "Parent Elective Code(Leave blank if not an elective)": "Parent Elective Code(Leave blank if not an elective)",
+    "Course": "Course Code(Or child elective code)",
+    "Default Elective (YES/NO)": "Default Elective (YES/NO)",
+    "Prerequisite": "Prerequisite",
+    "Corequisite": "Corequisite",
+    "Required Units": "Required Units",
+    "--- THIS ROW WILL BE IGNORED ON IMPORT. DO NOT DELETE THIS ROW. DO NOT REPLACE WITH ACTUAL VALUES. ---":
+        "--- THIS ROW WILL BE IGNORED ON IMPORT. DO NOT DELETE THIS ROW. DO NOT REPLACE WITH ACTUAL VALUES. ---"
+}
+
+
+def _sort_curricula(df, year_col, term_col):
+    """Sort every (Program Code, Revision ID) curriculum chronologically in one go.
+
+    Returns the sorted frame and the curriculum number of each of its rows.
+    """
+    group = df.groupby(["Program Code", "Revision ID"], sort=True).ngroup().to_numpy()
+    order = np.lexsort((df[term_col].to_numpy(), df[year_col].to_numpy(), group))
+    return df.iloc[order].copy(), group[order]
+
+
+def _prior_courses(groups, years, terms, courses):
+    """Yield, for each sorted row, the courses from earlier terms of its curriculum.
+
+    Courses of a (year, term) bucket are only added once the bucket ends, so
+    every row of a term sees the same set and the walk stays linear.
+    """
+    seen_courses = set()  # courses from terms before the current one
+    term_courses = []     # courses of the current (year, term) bucket
+    previous = None
+
+    for group, year, term, course in zip(groups, years, terms, courses):
+        bucket = (group, year, term)
+        if previous is None or group != previous[0]:
+            seen_courses = set()
+            term_courses = []
+        elif bucket != previous:
+            seen_courses.update(term_courses)
+            term_courses = []
+        previous = bucket
+        term_courses.append(str(course))
+        yield seen_courses
+
+
+def _split_prereqs(prereq_str):
+    # Split and clean prerequisites (comma, slash, or semicolon separated)
+    return [p.strip() for p in re.split(r'[,/;]', str(prereq_str).strip()) if p.strip()]
 
-def convert_programs(df):
+
+def convert_programs(df, revalidate=False):
+    """Convert an ERP programs export to the Edusuite curriculum layout.
+
+    Cleaning keeps only prerequisites taken in an earlier term, so no final
+    prerequisite report is shown by default: it would pass by construction.
+    Pass ``revalidate=True`` to re-check the converted frame independently
+    with :func:`validate_final_prereqs`.
+    """
     df = df.copy()
     removed_prereqs = []  # 👈 collect removed prerequisites
     removed_electives = []  # 👈 collect removed elective rows
@@ -31,65 +97,9 @@ def convert_programs(df):
     df["Term"] = df["Term"].apply(map_term)
 
     # Institute mapping
-    def map_institute(value):
-        value = str(value).strip().upper()
-        if value in [
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : LANGUAGE AND LITERATURE : LANGUAGE AND LITERATURE STUDIES",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : POLITICAL SCIENCE : POLITICAL SCIENCE",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : INTERDISCIPLINARY STUDIES",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : COMMUNICATION DEPARTMENT : COMMUNICATION",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : PSYCHOLOGY : PSYCHOLOGY",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : COMMUNICATION DEPARTMENT : COMMUNICATION GRADUATE PROGRAM",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : LANGUAGE AND LITERATURE : LANGUAGE AND LITERATURE STUDIES GRADUATE PROGRAM",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : PSYCHOLOGY : PSYCHOLOGY GRADUATE PROGRAM",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : BIOLOGY DEPARTMENT : BIOLOGY GRADUATE PROGRAM",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : PHYSICS & MATH : MATHEMATICS - GS",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : PHYSICS & MATH : MATHEMATICS",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : BIOLOGY DEPARTMENT : BIOLOGY",
-            "ACADEMIC : INST. OF ARTS AND SCIENCES : INTERNATIONAL STUDIES : INTERNATIONAL STUDIES"
-        ]:
-            return "IAS"
-        
-        if value in [
-            "ACADEMIC : INST. OF EDUCATION : EDUCATION: GS : EDUCATION GRADUATE PROGRAM AND TNE",
-            "ACADEMIC : INST. OF EDUCATION : EDUCATION : EDUCATION"
-        ]:
-            return "IE"
-            
-        elif value in [
-            "ACADEMIC : INST. ARCHITECTURE & FINE ARTS : FINE ARTS",
-            "ACADEMIC : INST. ARCHITECTURE & FINE ARTS : ARCHITECTURE"
-        ]:
-            return "IARFA"
-
-        elif value in [
-            "ACADEMIC : INST. ACCOUNT, BUSINESS FINANCE : ACCOUNTANCY",
-            "ACADEMIC : INST. ACCOUNT, BUSINESS FINANCE : BUSINESS ADMINISTRATION",
-            "ACADEMIC : INST. ACCOUNT, BUSINESS FINANCE : INTERNAL AUDITING",
-            "ACADEMIC : INST. ACCOUNT, BUSINESS FINANCE : ECONOMICS",
-            "ACADEMIC : INST. ACCOUNT, BUSINESS FINANCE : HUMAN RESOURCES AND ORGANIZATIONAL DEVELOPMENT"
-        ]:
-            return "IABF"
-        
-        elif value in [
-            "ACADEMIC : INST. OF TOURISM & HOTEL MGMT : HOTEL AND RESTAURANT MANAGEMENT",
-            "ACADEMIC : INST. OF TOURISM & HOTEL MGMT : TOURISM MANAGEMENT",
-            "ACADEMIC : INST. OF TOURISM & HOTEL MGMT : TOURISM AND HOSPITALITY MANAGEMENT GRADUATE PROGRAM"
-        ]:
-            return "ITHM"
-        
-        elif value in [
-            "ACADEMIC : INST. OF HEALTH SCIENCES & NURSING : IN DEPT. : NURSING GRADUATE PROGRAM",
-            "ACADEMIC : INST. OF HEALTH SCIENCES & NURSING : IHSN : NUTRITION AND DIETETICS",
-            "ACADEMIC : INST. OF HEALTH SCIENCES & NURSING : IHSN : PHARMACY",
-            "ACADEMIC : INST. OF HEALTH SCIENCES & NURSING : MEDTECH DEPT. : MEDICAL TECHNOLOGY",
-            "ACADEMIC : INST. OF HEALTH SCIENCES & NURSING : IN DEPT. : NURSING"
-        ]:
-            return "IHSN"
-        else:
-            return "UNKNOWN"
-
-    df["Institute Code"] = df["Institute Code"].apply(map_institute)
+    mapping = get_mapping("program_institutes")
+    mapping.warn_unmatched(df["Institute Code"], "Institute Code")
+    df["Institute Code"] = mapping.map(df["Institute Code"])
 
     # ⚠️ Remove elective rows with 3-letter + 4-digit course codes (e.g., ABC1234)
     if "Type" in df.columns and "Course" in df.columns:
@@ -102,79 +112,70 @@ def convert_programs(df):
         df = df[~mask]
 
         if not removed_electives.empty:
-            st.warning(f"⚠️ {len(removed_electives)} 'Elective' rows with 3-letter + 4-digit course codes were removed.")
-            st.dataframe(removed_electives)
+            ui.warning(f"⚠️ {len(removed_electives)} 'Elective' rows with 3-letter + 4-digit course codes were removed.")
+            ui.dataframe(removed_electives)
         else:
-            st.info("✅ No invalid 'Elective' rows found.")
+            ui.info("✅ No invalid 'Elective' rows found.")
     else:
-        st.warning("⚠️ Missing 'Type' or 'Course' column — elective validation skipped.")
+        ui.warning("⚠️ Missing 'Type' or 'Course' column — elective validation skipped.")
 
     # ✅ Prerequisite alignment check
-    def validate_prerequisites(sub_df):
-     # 🧹 Clean numeric columns first — avoids ValueError later
-        sub_df["Academic Year"] = pd.to_numeric(sub_df["Academic Year"], errors="coerce")
-        sub_df["Term"] = pd.to_numeric(sub_df["Term"], errors="coerce")
+    def validate_prerequisites(df):
+        # 🧹 Clean numeric columns first — avoids ValueError later
+        df["Academic Year"] = pd.to_numeric(df["Academic Year"], errors="coerce")
+        df["Term"] = pd.to_numeric(df["Term"], errors="coerce")
 
-    # Drop any rows without valid year or term
-        sub_df = sub_df.dropna(subset=["Academic Year", "Term"])
+        # Drop any rows without valid year or term
+        df = df.dropna(subset=["Academic Year", "Term"])
 
-    # Sort to ensure chronological validation
-        sub_df = sub_df.sort_values(by=["Academic Year", "Term"])
+        df, groups = _sort_curricula(df, "Academic Year", "Term")
 
-        seen_courses = set()
+        years = df["Academic Year"].to_numpy()
+        terms = df["Term"].to_numpy()
+        programs = df["Program Code"].to_numpy()
+        courses = df["Course"].to_numpy()
+        prereqs = df["Prerequisite"].to_numpy()
 
-        for idx, row in sub_df.iterrows():
-            prereq_str = str(row.get("Prerequisite", "")).strip()
-            if prereq_str:
-            # Split and clean prerequisites (comma, slash, or semicolon separated)
-                prereq_list = re.split(r'[,/;]', prereq_str)
-                prereq_list = [p.strip() for p in prereq_list if p.strip()]
+        cleaned = np.empty(len(df), dtype=object)
+        prior = _prior_courses(groups, years, terms, courses)
 
-            year = int(row["Academic Year"])
-            term = int(row["Term"])
-
-            # Collect all courses from prior years/terms
-            prior_courses = sub_df[
-                (sub_df["Academic Year"] < year)
-                | ((sub_df["Academic Year"] == year) & (sub_df["Term"] < term))
-            ]["Course"].astype(str).tolist()
+        for i, seen_courses in enumerate(prior):
+            prereq_list = _split_prereqs(prereqs[i])
 
             # Check which prereqs are valid or invalid
-            valid_prereqs = [p for p in prereq_list if p in prior_courses]
-            invalid_prereqs = [p for p in prereq_list if p not in prior_courses]
+            valid_prereqs = [p for p in prereq_list if p in seen_courses]
+            invalid_prereqs = [p for p in prereq_list if p not in seen_courses]
 
             # Record any invalid prereqs found
             if invalid_prereqs:
                 removed_prereqs.append({
-                    "Program": row["Program Code"],
-                    "Course": row["Course"],
+                    "Program": programs[i],
+                    "Course": courses[i],
                     "Removed": ", ".join(invalid_prereqs)
                 })
 
             # Keep only the valid ones
-            sub_df.at[idx, "Prerequisite"] = ", ".join(valid_prereqs)
-
-        seen_courses.add(str(row["Course"]).strip())
+            cleaned[i] = ", ".join(valid_prereqs)
 
-        return sub_df
+        df["Prerequisite"] = cleaned
+        return df
 
 
     # Apply per (Program Code, Revision ID)
 
     # 🧹 Clean up course and prerequisite spacing and symbols
     df["Course"] = df["Course"].astype(str).str.strip().replace(r"\s+", " ", regex=True)
-    df["Prerequisite"] = df["Prerequisite"].astype(str).str.strip().replace(r"\s+", " ", regex=True)
+    df["Prerequisite"] = df["Prerequisite"].fillna("").astype(str).str.strip().replace(r"\s+", " ", regex=True)
 
-    
-    df = df.groupby(["Program Code", "Revision ID"], group_keys=False).apply(validate_prerequisites)
+    df = validate_prerequisites(df)
 
     # ⚠️ Show warning for removed prerequisites
     if removed_prereqs:
         removed_df = pd.DataFrame(removed_prereqs)
-        st.warning("⚠️ Some invalid prerequisites were removed due to missing earlier courses.")
-        st.dataframe(removed_df)
+        ui.warning("⚠️ Some invalid prerequisites were removed due to missing earlier courses.")
+        ui.dataframe(removed_df)
     else:
-        st.info("✅ All prerequisites are valid and aligned with their year and term.")
+        ui.info("✅ All prerequisites are valid and aligned with their year and term.")
 
     # Ensure required columns exist
     for col in [
@@ -187,66 +188,49 @@ def convert_programs(df):
         if col not in df.columns:
             df[col] = ""
 
-    # Final column mapping
-    column_mapping = {
-        "Program Code": "Program Code",
-        "Description": "Description",
-        "Institute Code": "Institute Code",
-        "Revision ID": "Revision ID",
-        "Academic Year": "Academic Year(1,2,3...)",
-        "Term": "Term(1,2,3...)",
-        "Parent Elective Code(Leave blank if not an elective)": "Parent Elective Code(Leave blank if not an elective)",
-        "Course": "Course Code(Or child elective code)",
-        "Default Elective (YES/NO)": "Default Elective (YES/NO)",
-        "Prerequisite": "Prerequisite",
-        "Corequisite": "Corequisite",
-        "Required Units": "Required Units",
-        "--- THIS ROW WILL BE IGNORED ON IMPORT. DO NOT DELETE THIS ROW. DO NOT REPLACE WITH ACTUAL VALUES. ---":
-            "--- THIS ROW WILL BE IGNORED ON IMPORT. DO NOT DELETE THIS ROW. DO NOT REPLACE WITH ACTUAL VALUES. ---"
-    }
-
-    converted_df = df.rename(columns=column_mapping)
-    available_columns = [col for col in column_mapping.values() if col in converted_df.columns]
+    # Rename columns
+    converted_df = df.rename(columns=COLUMN_MAPPING)
+    available_columns = [col for col in COLUMN_MAPPING.values() if col in converted_df.columns]
     converted_df = converted_df[available_columns]
 
-    validate_final_prereqs(converted_df)
+    # Cleaning kept only prerequisites taken in an earlier term, so without
+    # revalidate there is nothing to report
+    if revalidate:
+        validate_final_prereqs(converted_df)
     return converted_df
 
 
 def validate_final_prereqs(converted_df):
+    """Report prerequisites that do not come from an earlier term of the same curriculum.
+
+    The converted frame is checked in a single sorted pass.
+    """
     invalid_rows = []
 
-    for _, group in converted_df.groupby(["Program Code", "Revision ID"]):
-        group = group.sort_values(by=["Academic Year(1,2,3...)", "Term(1,2,3...)"])
-        course_list = group["Course Code(Or child elective code)"].astype(str).tolist()
-
-        for _, row in group.iterrows():
-            prereq_str = str(row.get("Prerequisite", "")).strip()
-            if prereq_str:
-                prereqs = re.split(r'[,/;]', prereq_str)
-                prereqs = [p.strip() for p in prereqs if p.strip()]
-
-                year = int(row["Academic Year(1,2,3...)"])
-                term = int(row["Term(1,2,3...)"])
-
-                prior_courses = group[
-                    (group["Academic Year(1,2,3...)"].astype(int) < year)
-                    | ((group["Academic Year(1,2,3...)"].astype(int) == year) & (group["Term(1,2,3...)"].astype(int) < term))
-                ]["Course Code(Or child elective code)"].astype(str).tolist()
-
-                for prereq in prereqs:
-                    if prereq not in prior_courses:
-                        invalid_rows.append({
-                            "Program": row["Program Code"],
-                            "Course": row["Course Code(Or child elective code)"],
-                            "Invalid Prerequisite": prereq,
-                            "Year": year,
-                            "Term": term
-                        })
+    year_col, term_col = "Academic Year(1,2,3...)", "Term(1,2,3...)"
+    group, groups = _sort_curricula(converted_df, year_col, term_col)
+
+    years = group[year_col].astype(int).to_numpy()
+    terms = group[term_col].astype(int).to_numpy()
+    programs = group["Program Code"].to_numpy()
+    courses = group["Course Code(Or child elective code)"].to_numpy()
+    prereqs = group["Prerequisite"].to_numpy() if "Prerequisite" in group.columns else np.full(len(group), "")
+
+    prior = _prior_courses(groups, years, terms, courses)
+    for i, prior_courses in enumerate(prior):
+        for prereq in _split_prereqs(prereqs[i]):
+            if prereq not in prior_courses:
+                invalid_rows.append({
+                    "Program": programs[i],
+                    "Course": courses[i],
+                    "Invalid Prerequisite": prereq,
+                    "Year": int(years[i]),
+                    "Term": int(terms[i])
+                })
 
     if invalid_rows:
         invalid_df = pd.DataFrame(invalid_rows)
-        st.error("❌ Validation Failed: Some prerequisites are still invalid after conversion.")
-        st.dataframe(invalid_df)
+        ui.error("❌ Validation Failed: Some prerequisites are still invalid after conversion.")
+        ui.dataframe(invalid_df)
     else:
-        st.success("✅ Validation Passed: All prerequisites align with their year and term.")
+        ui.success("✅ Validation Passed: All prerequisites align with their year and term.")
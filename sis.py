@@ -1,27 +1,248 @@
+import re
+import unicodedata
+
+import numpy as np
 import pandas as pd
-import streamlit as st
+import ui
+from clean import apply_unique
+from dates import normalize_dates
+from mappings import _ngrams
 
-def find_duplicate_differences(df: pd.DataFrame, id_column: str = "Student Number"):
-    df = df.astype(str).fillna("")
+IDENTICAL = "(all columns identical)"
+
+# Near-duplicate search: records are only compared inside a block of the same
+# birth date and surname prefix, or within WINDOW places of each other when a
+# birth date's records are sorted by given name (which catches typos in the
+# first letters of the surname).
+SURNAME_PREFIX = 3
+MAX_BLOCK = 50
+WINDOW = 5
+MIN_SCORE = 0.75
+# Trigrams are hashed into this many buckets to bound a pair's score before
+# the exact comparison; names and pairs are processed CHUNK at a time
+GRAM_BUCKETS = 64
+CHUNK = 100_000
 
-    # Find all duplicates based on Student Number
-    duplicates = df[df.duplicated(subset=[id_column], keep=False)].sort_values(by=id_column)
 
-    if duplicates.empty:
-        print("✅ No duplicate student numbers found.")
+def find_duplicate_differences(df: pd.DataFrame, id_column: str = "Student Number"):
+    """Report, for every duplicated student number, the columns whose values differ.
+
+    One row per (student, differing column) with the distinct values found;
+    a student whose rows are exact copies gets a single ``IDENTICAL`` row.
+    Cells are compared by hash, so only the values reported are turned into text.
+    """
+    duplicated = df[id_column].duplicated(keep=False).to_numpy()
+    if not duplicated.any():
+        ui.success("✅ No duplicate student numbers found.")
         return pd.DataFrame()
 
-    # Select only relevant columns (Student Number + name-related + others if needed)
+    duplicates = df.loc[duplicated]
+    codes, students = pd.factorize(duplicates[id_column], use_na_sentinel=False)
+
+    # Name columns first, then the rest in file order
     name_columns = [col for col in df.columns if col.lower() in ["first name", "middle name", "last name"]]
-    selected_columns = [id_column] + name_columns
+    columns = name_columns + [col for col in df.columns if col != id_column and col not in name_columns]
+
+    rows = np.bincount(codes, minlength=len(students))
+    differs = np.zeros((len(students), len(columns)), dtype=bool)  # student x column
+
+    reports = []
+    for i, col in enumerate(columns):
+        # First row of every distinct (student, value) pair, compared by hash
+        hashes = pd.util.hash_pandas_object(duplicates[col], index=False).to_numpy()
+        first = ~pd.DataFrame({"student": codes, "value": hashes}).duplicated().to_numpy()
+        differs[:, i] = np.bincount(codes[first], minlength=len(students)) > 1
+        if not differs[:, i].any():
+            continue
+
+        positions = np.flatnonzero(first & differs[codes, i])
+        positions = positions[np.argsort(codes[positions], kind="stable")]
+        groups, starts, counts = np.unique(codes[positions], return_index=True, return_counts=True)
+        texts = np.array([("" if pd.isna(v) else str(v)) + " | " for v in duplicates[col].to_numpy()[positions]],
+                         dtype=object)
+        reports.append(pd.DataFrame({
+            "_group": groups,
+            "_order": i,
+            "Column": col,
+            "Distinct Values": counts,
+            "Values": [text[:-3] for text in np.add.reduceat(texts, starts)],
+        }))
+
+    identical = np.flatnonzero(~differs.any(axis=1))
+    reports.append(pd.DataFrame({"_group": identical, "_order": -1, "Column": IDENTICAL,
+                                 "Distinct Values": 1, "Values": ""}))
+
+    result_df = pd.concat(reports, ignore_index=True)
+    result_df.insert(0, id_column, np.asarray(students, dtype=object)[result_df["_group"]])
+    result_df.insert(1, "Rows", rows[result_df["_group"]])
+    result_df["_id"] = result_df[id_column].astype(str)
+    result_df = (result_df.sort_values(["_id", "_order"], kind="stable")
+                 .drop(columns=["_group", "_order", "_id"]).reset_index(drop=True))
+
+    ui.write(f"⚠️ Found {int(rows.sum())} rows with duplicate student numbers "
+             f"({len(students)} students, {len(students) - len(identical)} with differing values).")
+    return result_df
+
+
+def _name_key(value) -> str:
+    """Lower-case letters and single spaces only, accents removed."""
+    if pd.isna(value):
+        return ""
+    text = unicodedata.normalize("NFKD", str(value)).encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.sub(r"[^a-z ]", "", text.lower()).split())
+
+
+def _window_pairs(order: np.ndarray, block: np.ndarray, window: int):
+    """Pairs of rows up to ``window - 1`` places apart in ``order`` and in the same block."""
+    left, right = [], []
+    for offset in range(1, window):
+        i, j = order[:-offset], order[offset:]
+        same = block[i] == block[j]
+        if not same.any():
+            break  # sorted by block, so no block is longer than this
+        left.append(i[same])
+        right.append(j[same])
+    if not left:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(left), np.concatenate(right)
+
+
+def _gram_buckets(names: np.ndarray):
+    """Per name, how many of its distinct trigrams fall in each hash bucket, and how many there are.
+
+    Two names share at most ``np.minimum(counts[a], counts[b]).sum()``
+    trigrams, which rules out most candidate pairs without building any sets.
+    """
+    counts = np.zeros((len(names), GRAM_BUCKETS), dtype=np.uint16)
+    sizes = np.zeros(len(names), dtype=np.int64)
+    for start in range(0, len(names), CHUNK):
+        chunk = names[start:start + CHUNK]
+        # Same padding as mappings._ngrams; a name of n letters has n trigrams
+        lengths = np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk))
+        width = int(lengths.max()) + 2
+        chars = np.array([f" {name} " for name in chunk], dtype=f"S{width}").view(np.uint8)
+        chars = chars.reshape(len(chunk), width).astype(np.int64)
+        grams = (chars[:, :-2] << 16) | (chars[:, 1:-1] << 8) | chars[:, 2:]
+        grams[np.arange(width - 2) >= lengths[:, None]] = -1
+        grams.sort(axis=1)
+        distinct = grams >= 0
+        distinct[:, 1:] &= grams[:, 1:] != grams[:, :-1]
+
+        rows, cols = np.nonzero(distinct)
+        buckets = ((grams[rows, cols] * 2654435761) >> 16) % GRAM_BUCKETS
+        counts[start:start + len(chunk)] = np.bincount(
+            rows * GRAM_BUCKETS + buckets, minlength=len(chunk) * GRAM_BUCKETS).reshape(len(chunk), GRAM_BUCKETS)
+        sizes[start:start + len(chunk)] = distinct.sum(axis=1)
+    return counts, sizes
+
+
+def find_near_duplicates(df: pd.DataFrame, id_column: str = "Student Number", min_score: float = MIN_SCORE):
+    """Pairs of different student numbers that look like the same person.
+
+    Records with the same date of birth are paired when they share a surname
+    prefix or sit next to each other in given-name order, and each candidate
+    pair is scored by the trigram similarity of the full name. Pairs scoring
+    at least ``min_score`` are returned, best first, once per pair of student
+    numbers with the smaller number as A.
+    """
+    required_cols = [id_column, "First Name", "Last Name", "Date of Birth"]
+    for col in required_cols:
+        if col not in df.columns:
+            ui.error(f"Missing required column: {col}")
+            return pd.DataFrame()
+
+    first, last = apply_unique(df["First Name"], _name_key), apply_unique(df["Last Name"], _name_key)
+    middle = apply_unique(df["Middle Name"], _name_key) if "Middle Name" in df.columns else pd.Series("", index=df.index)
+    full = (first + " " + middle + " " + last).str.replace(r"\s+", " ", regex=True).str.strip()
+    birth, _ = normalize_dates(df["Date of Birth"])
+
+    # Student numbers as text, without the ".0" a float column gives them when some are missing
+    id_values = df[id_column]
+    if pd.api.types.is_float_dtype(id_values) and (id_values.dropna() % 1 == 0).all():
+        id_values = id_values.astype("Int64")
+    id_text = id_values.astype("string").str.strip()
+    has_id = (id_text.fillna("") != "").to_numpy()
+
+    # Only records with a student number, a birth date and a name can be blocked
+    usable = np.flatnonzero(((birth != "") & (full != "")).to_numpy() & has_id)
+    birth_codes = pd.factorize(birth.to_numpy()[usable])[0]
+    prefix_codes = pd.factorize(last.str[:SURNAME_PREFIX].to_numpy()[usable])[0]
+    name_codes, names = pd.factorize(full.to_numpy()[usable])
+    given_codes = pd.factorize(first.to_numpy()[usable], sort=True)[0]
+
+    # Block on (birth date, surname prefix): every pair in a block, up to MAX_BLOCK apart
+    block = birth_codes.astype(np.int64) * (prefix_codes.max(initial=0) + 1) + prefix_codes
+    blocked = _window_pairs(np.lexsort((name_codes, block)), block, MAX_BLOCK)
+    # Sorted neighbourhood on given name within each birth date
+    neighbours = _window_pairs(np.lexsort((given_codes, birth_codes)), birth_codes, WINDOW)
+
+    left = np.concatenate([blocked[0], neighbours[0]])
+    right = np.concatenate([blocked[1], neighbours[1]])
+    pair_keys = pd.unique(np.minimum(left, right) * len(usable) + np.maximum(left, right))
+    left, right = usable[pair_keys // max(len(usable), 1)], usable[pair_keys % max(len(usable), 1)]
+
+    # The same student number twice is find_duplicate_differences' job
+    id_codes, ids = pd.factorize(id_text)
+    # Rank of each student number, compared as numbers when they all are ("9" < "10")
+    numbers = pd.to_numeric(pd.Series(ids, dtype=object), errors="coerce")
+    order = np.argsort(numbers.to_numpy() if numbers.notna().all() else np.asarray(ids, dtype=str), kind="stable")
+    id_rank = np.empty(len(ids), dtype=np.int64)
+    id_rank[order] = np.arange(len(ids))
+    different = id_codes[left] != id_codes[right]
+    left, right = left[different], right[different]
+
+    # Score each distinct pair of names once
+    position = np.full(len(df), -1)
+    position[usable] = np.arange(len(usable))
+    a, b = name_codes[position[left]], name_codes[position[right]]
+    pair_index, name_pairs = pd.factorize(np.minimum(a, b).astype(np.int64) * len(names) + np.maximum(a, b))
+    i, j = name_pairs // max(len(names), 1), name_pairs % max(len(names), 1)
 
-    # Add other columns to show potential differences (optional)
-    other_cols = [col for col in df.columns if col not in selected_columns]
-    selected_columns += other_cols
+    # Only pairs whose bucket bound can reach min_score get the exact comparison
+    counts, sizes = _gram_buckets(names)
+    bound = np.zeros(len(name_pairs))
+    for start in range(0, len(name_pairs), CHUNK):
+        ci, cj = i[start:start + CHUNK], j[start:start + CHUNK]
+        shared = np.minimum(counts[ci], counts[cj]).sum(axis=1)
+        bound[start:start + CHUNK] = 2 * shared / (sizes[ci] + sizes[cj])
+    name_scores = np.zeros(len(name_pairs))
+    for k in np.flatnonzero(bound >= min_score):
+        grams_i, grams_j = _ngrams(names[i[k]]), _ngrams(names[j[k]])
+        name_scores[k] = 2 * len(grams_i & grams_j) / (len(grams_i) + len(grams_j))
+    scores = name_scores[pair_index]
 
-    result_df = duplicates[selected_columns]
+    keep = scores >= min_score
+    left, right, scores = left[keep], right[keep], scores[keep]
+    # One row per pair of student numbers, smaller number first, with its best score
+    swap = id_rank[id_codes[left]] > id_rank[id_codes[right]]
+    left, right = np.where(swap, right, left), np.where(swap, left, right)
+    id_pairs = id_codes[left].astype(np.int64) * len(ids) + id_codes[right]
+    order = np.lexsort((-scores, id_pairs))
+    best = order[np.r_[True, id_pairs[order][1:] != id_pairs[order][:-1]]] if len(order) else order
+    left, right, scores = left[best], right[best], np.round(scores[best], 3)
+    # Best score first, then by student number A
+    order = np.lexsort((id_rank[id_codes[left]], -scores))
+    left, right, scores = left[order], right[order], scores[order]
+    # Report the names as they were entered
+    name_cols = [col for col in ("First Name", "Middle Name", "Last Name") if col in df.columns]
+    written = df.iloc[np.concatenate([left, right])][name_cols].fillna("").astype(str)
+    written = np.array([" ".join(" ".join(row).split()) for row in written.itertuples(index=False)], dtype=object)
+    result_df = pd.DataFrame({
+        f"{id_column} A": np.asarray(ids)[id_codes[left]],
+        f"{id_column} B": np.asarray(ids)[id_codes[right]],
+        "Name A": written[:len(left)],
+        "Name B": written[len(left):],
+        "Date of Birth": birth.to_numpy()[left],
+        "Score": scores,
+    })
 
-    st.write(f"⚠️ Found {len(result_df)} rows with duplicate student numbers.")
+    skipped = len(df) - len(usable)
+    if result_df.empty:
+        ui.success("✅ No likely duplicate students found under different student numbers.")
+    else:
+        ui.warning(f"⚠️ Found {len(result_df)} pairs of student numbers that look like the same person.")
+    if skipped:
+        ui.info(f"ℹ️ {skipped} rows without a student number, a name or a readable date of birth were not compared.")
     return result_df
 
 
@@ -33,7 +254,7 @@ def check_fields(df: pd.DataFrame, id_column: str = "Student Number"):
     required_cols = ["First Name", "Middle Name", "Last Name"]
     for col in required_cols:
         if col not in df.columns:
-            st.error(f"Missing required column: {col}")
+            ui.error(f"Missing required column: {col}")
             return pd.DataFrame()
 
     # Fill only NaN with empty string
@@ -54,15 +275,15 @@ def check_fields(df: pd.DataFrame, id_column: str = "Student Number"):
             _sort_key=df[sort_col].astype(str)
         ).sort_values(by="_sort_key").drop(columns="_sort_key")
     except Exception as e:
-        st.warning(f"⚠️ Could not sort by {sort_col}: {e}")
+        ui.warning(f"⚠️ Could not sort by {sort_col}: {e}")
         missing_fields = df.loc[mask]
 
     # Display results
     if missing_fields.empty:
-        st.success("✅ No students found with all name fields empty.")
+        ui.success("✅ No students found with all name fields empty.")
         return pd.DataFrame()
 
-    st.warning(f"⚠️ Found {len(missing_fields)} students with missing First, Middle, and Last names.")
+    ui.warning(f"⚠️ Found {len(missing_fields)} students with missing First, Middle, and Last names.")
     return missing_fields
 
 
@@ -0,0 +1,59 @@
+import pandas as pd
+from collections import Counter
+from contextlib import nullcontext
+
+import ui
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def convert_csv_in_chunks(source, destination, convert, validate=None, chunksize: int = DEFAULT_CHUNKSIZE,
+                          errors_destination=None, usecols=None):
+    """Convert a CSV chunk by chunk and append each converted chunk to ``destination``.
+
+    Only row-local converters (each output row depends on its input row only)
+    can be streamed: grades, students, courses and the ``clean.py`` cleaners.
+    Peak memory is bounded by ``chunksize`` instead of the file size.
+
+    ``source`` is a path or a seekable binary file; ``destination`` is a path
+    that is overwritten. Every column is read as text so that a column does not
+    change type from one chunk to the next. ``validate`` optionally maps a
+    converted chunk to a :class:`grading.ValidationReport`; its counts are
+    summed over all chunks and, when ``errors_destination`` is given, its
+    row-level failures are appended there as CSV. Reports shown through
+    :func:`ui.show_report` are merged over the chunks and shown once at the end. ``usecols`` limits the
+    columns read, as in ``pd.read_csv``.
+
+    Returns ``(rows, counts)``.
+    """
+    try:
+        return _stream(source, destination, convert, validate, chunksize, errors_destination, usecols, "utf-8")
+    except UnicodeDecodeError:
+        # Same fallback as app.py; the output is rewritten from the start
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return _stream(source, destination, convert, validate, chunksize, errors_destination, usecols, "latin1")
+
+
+def _stream(source, destination, convert, validate, chunksize, errors_destination, usecols, encoding):
+    rows = 0
+    counts = Counter()
+    with open(destination, "w", encoding="utf-8", newline="") as out, \
+            (open(errors_destination, "w", encoding="utf-8", newline="") if errors_destination
+             else nullcontext()) as errors_out:
+        reader = pd.read_csv(source, chunksize=chunksize, encoding=encoding, dtype=str, usecols=usecols)
+        # Unmatched-mapping and date reports are shown once for the file, not per chunk
+        with ui.merged_reports():
+            for i, chunk in enumerate(reader):
+                converted = convert(chunk)
+                converted.to_csv(out, header=(i == 0), index=False)
+
+                rows += len(converted)
+                if validate is not None:
+                    # Chunk indexes continue across chunks, so "Row" stays file-wide
+                    report = validate(converted)
+                    counts.update(report.counts)
+                    if errors_out is not None:
+                        report.to_csv(errors_out, header=(i == 0))
+
+    return rows, dict(counts)
@@ -1,13 +1,27 @@
+import numpy as np
 import pandas as pd
 import re
 
+import ui
+from dates import normalize_dates
+
+# Edusuite student layout, in order
+FINAL_COLUMNS = [
+    "First Name", "Middle Name", "Last Name",
+    "Date of Birth(Must be in yyyy-MM-dd format)",
+    "Sex(FEMALE,MALE)", "EMAIL", "Student Number",
+    "STARTING TERM", "Is Transferee(TRANSFEREE,REGULAR)",
+    "Program Code", "Program Revision", "Tuition Plan Name", "--- THIS ROW WILL BE IGNORED ON IMPORT. DO NOT DELETE THIS ROW. DO NOT REPLACE WITH ACTUAL VALUES. ---"
+]
+
+
 def convert_students(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
 
     # Date of Birth → format yyyy-MM-dd
-    df["Date of Birth(Must be in yyyy-MM-dd format)"] = pd.to_datetime(
-        df["Date of Birth"], errors="coerce"
-    ).dt.strftime("%Y-%m-%d")
+    dates, report = normalize_dates(df["Date of Birth"], missing=np.nan)
+    df["Date of Birth(Must be in yyyy-MM-dd format)"] = dates
+    ui.show_report(report, "Date of Birth")
 
     # Gender → uppercase
     df["Sex(FEMALE,MALE)"] = df["Gender"].astype(str).str.upper()
@@ -45,14 +59,6 @@ def convert_students(df: pd.DataFrame) -> pd.DataFrame:
     df.rename(columns=rename_map, inplace=True)
 
     # Keep only the relevant columns
-    final_columns = [
-        "First Name", "Middle Name", "Last Name",
-        "Date of Birth(Must be in yyyy-MM-dd format)",
-        "Sex(FEMALE,MALE)", "EMAIL", "Student Number",
-        "STARTING TERM", "Is Transferee(TRANSFEREE,REGULAR)",
-        "Program Code", "Program Revision", "Tuition Plan Name", "--- THIS ROW WILL BE IGNORED ON IMPORT. DO NOT DELETE THIS ROW. DO NOT REPLACE WITH ACTUAL VALUES. ---"
-    ]
-
-    converted_df = df[final_columns]
+    converted_df = df[FINAL_COLUMNS]
 
     return converted_df
@@ -0,0 +1,205 @@
+"""Streamlit output that degrades to logging outside a running Streamlit script.
+
+The converters report progress through these helpers instead of calling
+``st.*`` directly, so the same functions work in the web app, in the batch
+CLI and inside worker processes that have no Streamlit session.
+
+Calls can also be recorded while a conversion runs and replayed later, which
+lets the app serve a cached conversion together with its messages.
+"""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+log = logging.getLogger("feuploader")
+
+# Frames longer than this are cut to their first rows before going to the browser
+PREVIEW_ROWS = 1000
+
+# Messages of the conversion currently being recorded, as (name, args) tuples.
+# Streamlit runs every session on its own thread, and each thread has its own
+# context, so one session never records into another's list.
+_recording = ContextVar("ui_recording", default=None)
+
+# Reports held back while a file is converted in chunks, merged by (type, args)
+_held_reports = ContextVar("ui_held_reports", default=None)
+
+
+class StopRequested(Exception):
+    """Raised by :func:`stop` while recording, so the recorder can keep the result.
+
+    ``confirmed`` is the callable given to :func:`stop`, if any.
+    """
+
+    def __init__(self, *args, confirmed=None):
+        super().__init__(*args)
+        self.confirmed = confirmed
+
+
+def has_streamlit() -> bool:
+    """True when called from a script run by ``streamlit run``."""
+    return get_script_run_ctx(suppress_warning=True) is not None
+
+
+@contextmanager
+def recording():
+    """Record every message emitted inside the block into the yielded list."""
+    messages = []
+    token = _recording.set(messages)
+    try:
+        yield messages
+    finally:
+        _recording.reset(token)
+
+
+@contextmanager
+def merged_reports():
+    """Show each kind of report once for the whole block instead of once per call.
+
+    Reports passed to :func:`show_report` inside the block are merged with the
+    earlier ones of the same type and arguments, and shown when the block ends
+    without an error; used to report once for a file converted in chunks.
+    """
+    held = {}
+    token = _held_reports.set(held)
+    try:
+        yield
+    finally:
+        _held_reports.reset(token)
+    for (_, args), report in held.items():
+        report.show(*args)
+
+
+def show_report(report, *args):
+    """``report.show(*args)``, or hold it for :func:`merged_reports`.
+
+    ``report`` needs ``show(*args)`` and ``merge(other)`` returning the combined report.
+    """
+    held = _held_reports.get()
+    if held is None:
+        report.show(*args)
+        return
+    key = (type(report), args)
+    held[key] = held[key].merge(report) if key in held else report
+
+
+def replay(messages):
+    """Emit recorded messages again, in order."""
+    for name, args in messages:
+        if name == "stop":
+            stop()
+        else:
+            globals()[name](*args)
+
+
+def _record(name, *args):
+    messages = _recording.get()
+    if messages is not None:
+        messages.append((name, args))
+
+
+def success(message):
+    _record("success", message)
+    if has_streamlit():
+        st.success(message)
+    else:
+        log.info(message)
+
+
+def info(message):
+    _record("info", message)
+    if has_streamlit():
+        st.info(message)
+    else:
+        log.info(message)
+
+
+def warning(message):
+    _record("warning", message)
+    if has_streamlit():
+        st.warning(message)
+    else:
+        log.warning(message)
+
+
+def error(message):
+    _record("error", message)
+    if has_streamlit():
+        st.error(message)
+    else:
+        log.error(message)
+
+
+def write(message):
+    _record("write", message)
+    if has_streamlit():
+        st.write(message)
+    else:
+        log.info(message)
+
+
+def subheader(message):
+    _record("subheader", message)
+    if has_streamlit():
+        st.subheader(message)
+    else:
+        log.info(message)
+
+
+def dataframe(df):
+    _record("dataframe", df)
+    if has_streamlit():
+        if len(df) > PREVIEW_ROWS:
+            st.dataframe(df.head(PREVIEW_ROWS))
+            st.caption(f"Showing the first {PREVIEW_ROWS:,} of {len(df):,} rows.")
+        else:
+            st.dataframe(df)
+    else:
+        log.debug("%d rows x %d columns", *df.shape)
+
+
+def button_key(label) -> str:
+    """Session-state key of the button with this label."""
+    return f"ui.button:{label}"
+
+
+def button(label) -> bool:
+    """Streamlit button; headless runs never click it.
+
+    The button has a stable key, so callers can read whether it was just
+    clicked from ``st.session_state`` before the script reaches it.
+    """
+    _record("button", label)
+    return has_streamlit() and st.button(label, key=button_key(label))
+
+
+def clicked_buttons() -> tuple:
+    """Labels of the :func:`button` buttons clicked in the current rerun."""
+    if not has_streamlit():
+        return ()
+    prefix = button_key("")
+    return tuple(sorted(
+        key[len(prefix):] for key, value in st.session_state.items()
+        if isinstance(key, str) and key.startswith(prefix) and value is True
+    ))
+
+
+def stop(confirmed=None):
+    """Stop the script run, e.g. while a converter waits for confirmation.
+
+    Raises :class:`StopRequested` while recording, and outside Streamlit,
+    where nothing would stop and the unconfirmed result would be written.
+    ``confirmed`` is an optional picklable callable returning the converter's
+    result once its last :func:`button` is clicked; the conversion cache keeps
+    it, so the click is served without converting again.
+    """
+    if _recording.get() is not None:
+        _record("stop")
+        raise StopRequested(confirmed=confirmed)
+    if has_streamlit():
+        st.stop()
+    else:
+        raise StopRequested("stopped to wait for a confirmation that a headless run cannot give")